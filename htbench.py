@@ -0,0 +1,101 @@
+# This Python file uses the following encoding: utf-8
+"""
+ Prueba de memoria del modelo de configuracion de htconfig.py: compara
+ mantener en memoria las entradas de N nodos como diccionarios (modelo
+ anterior) y como ConfigEntry (__slots__ y comentarios compartidos).
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Recoleccion de basura antes de medir
+import gc
+# Medicion de memoria
+import tracemalloc
+# Medicion de tiempo
+import time
+# Modelo y lectura de la configuracion generada
+from htconfig import ConfigEntry, Install, VerificaTipo
+
+# Copia nueva de la cadena, como la crearia renderizar cada nodo por separado.
+def fresh(s):
+  return (s+".")[:-1]
+
+# Entradas de un nodo como diccionarios.
+def dictModel(entries,idx):
+  return [{"knob":fresh(k),"value":"%s" % v.replace("$(HOSTNAME)","node%s" % idx),
+           "comment":fresh(c),"stage":"cfgBench"} for k,v,c in entries]
+
+# Entradas de un nodo como ConfigEntry.
+def slotsModel(entries,idx):
+  return [ConfigEntry(fresh(k),"%s" % v.replace("$(HOSTNAME)","node%s" % idx),
+                      fresh(c),stage="cfgBench") for k,v,c in entries]
+
+# Bytes usados por los modelos de nodes nodos creados con build.
+def measure(build,entries,nodes):
+  gc.collect()
+  tracemalloc.start()
+  start=tracemalloc.get_traced_memory()[0]
+  fleet=[build(entries,idx) for idx in range(nodes)]
+  used=tracemalloc.get_traced_memory()[0]-start
+  tracemalloc.stop()
+  del fleet
+  return used
+
+# Listas ALLOW_WRITE de prueba: n entradas actuales y n/5 nuevas (3 de cada 4 ya permitidas).
+def allowLists(n):
+  current=[]
+  for i in range(n):
+    current.append(["*.d%s.org" % i,"h%s.d%s.net" % (i,i),"10.%s.%s.%s" % (i>>16&255,i>>8&255,i&255),"172.%s.%s.*" % (16+(i>>8&15),i&255)][i%4])
+  new=[]
+  for i in range(0,n,5):
+    new.append(["h.d%s.org" % i,"x%s.d%s.net" % (i,i),"10.%s.%s.%s" % (i>>16&255,i>>8&255,i&255),"172.%s.%s.9" % (16+(i>>8&15),i&255)][i%4])
+  return current,new
+
+"""
+ Prueba de regresion del filtro de reconfiguracion de cfgAllow: filtrar
+ las entradas nuevas contra la lista actual debe tomar menos de limit
+ segundos y coincidir con comparar las listas compactadas completas.
+"""
+def allowCheck(n,limit):
+  valida=VerificaTipo()
+  current,new=allowLists(n)
+  start=time.time()
+  index=valida.allowIndex(current)
+  kept=[e for e in new if not valida.allowCovered(index,e)]
+  used=time.time()-start
+  print("ALLOW_WRITE: %s current, %s new, %s kept in %.2fs / %s actuales, %s nuevas, %s conservadas en %.2fs" % (len(current),len(new),len(kept),used,len(current),len(new),len(kept),used))
+  agg=set(valida.aggregateAllow(current))
+  for e in new[:8]:
+    if((e in kept)!=(set(valida.aggregateAllow(current+[e]))!=agg)):
+      print("Error: %s wrongly filtered / filtrada incorrectamente" % e)
+      return False
+  if(used>limit):
+    print("Error: slower than %ss / mas lento que %ss" % (limit,limit))
+    return False
+  return True
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Config Model Memory Benchmark <=',
+    epilog='Ex/Ej: python %(prog)s -cf /etc/condor/condor_config.local -n 100000')
+  parser.add_argument('-cf', '--config-file', action="store", dest="config", help="Config file generated by htconfig.py/Archivo de configuracion generado por htconfig.py.")
+  parser.add_argument('-n', '--nodes', action="store", dest="nodes", type=int, default=10000, help="Nodes held in memory/Nodos en memoria.")
+  parser.add_argument('-ac', '--allow-check', action="store", dest="allow", type=int, nargs="?", const=10000, help="Instead of -cf: check reconfiguration ALLOW_WRITE filtering with ALLOW entries/En lugar de -cf: verificar el filtro de ALLOW_WRITE en reconfiguracion con ALLOW entradas.")
+  parser.add_argument('-acl', '--allow-check-limit', action="store", dest="allowlimit", type=float, default=5.0, help="Maximum seconds for -ac/Segundos maximos para -ac.")
+  result=parser.parse_args()
+
+  if(result.allow):
+    exit(0 if allowCheck(result.allow,result.allowlimit) else 1)
+  if(not result.config):
+    print("-cf: Missing config file / Falta archivo de configuracion")
+    exit(1)
+
+  with open(result.config,"r") as f:
+    entries=Install(None,"htbench.py").data2Entries(f.read())
+  old=measure(dictModel,entries,result.nodes)
+  new=measure(slotsModel,entries,result.nodes)
+  print("Nodes/Nodos: %s, entries per node/entradas por nodo: %s" % (result.nodes,len(entries)))
+  print("dict:        %10.1f MB (%s bytes/node)" % (old/1048576.0,old//max(result.nodes,1)))
+  print("ConfigEntry: %10.1f MB (%s bytes/node)" % (new/1048576.0,new//max(result.nodes,1)))
+  print("Reduction/Reduccion: %.1f%%" % (100.0*(old-new)/max(old,1)))
@@ -17,6 +17,26 @@ import socket
 import os
 # Fecha y hora
 from time import strftime
+# Hash del nombre del equipo para valores por nodo.
+import hashlib
+# Salida estructurada del modelo de configuracion.
+import json
+# Clasificacion de knobs que requieren reinicio.
+import re
+# Lectura de tareas cron desde archivo.
+import shlex
+# Instalacion de scripts incluidos.
+import shutil
+# Comparar scripts instalados con los incluidos.
+import filecmp
+# Agrupacion de IPs en las listas ALLOW_*.
+import ipaddress
+# Busqueda de redes en las listas ALLOW_* ya agrupadas.
+import bisect
+# Comentarios compartidos entre entradas (sys.intern).
+import sys
+# Consulta de valores con condor_config_val.
+import subprocess
 
 """
   Clase para validar los diferentes tipos de datos recibidos y utilizados
@@ -201,19 +221,262 @@ class VerificaTipo(object):
             ret=True
       return(ret)
 
+   # Convierte un periodo de HTCondor (300, 300s, 5m, 1h) a segundos,
+   #  retorna None si no es valido.
+   def period2Secs(self,var):
+    mult={"s":1,"m":60,"h":3600}
+    if self.checkIntStr(var):
+      return int(var)
+    if self.checkString(var) and var[-1] in mult and self.checkIntStr(var[:-1]):
+      return int(var[:-1])*mult[var[-1]]
+    return None
+
+   """
+    Detecta almacenamiento local escribible usando /proc/mounts y
+    /sys/block/*/queue/rotational. Retorna lista de diccionarios con
+    mount, kind (tmpfs, nvme, ssd, hdd) y free (MB libres). Los tmpfs solo
+    se incluyen si tmpfs es True.
+   """
+   def detectStorage(self,tmpfs=False):
+    ret=[]
+    try:
+      with open("/proc/mounts","r") as f:
+        mounts=[l.split() for l in f]
+    except IOError:
+      return(ret)
+    for m in mounts:
+      if(len(m)<4 or "ro" in m[3].split(",")):
+        continue
+      dev,mnt,fstype=m[0],m[1].replace("\\040"," "),m[2]
+      if(mnt.startswith("/proc") or mnt.startswith("/sys") or mnt.startswith("/run")):
+        continue
+      if(fstype=="tmpfs"):
+        if(not tmpfs):
+          continue
+        kind="tmpfs"
+      elif(dev.startswith("/dev/")):
+        # Buscar el disco (no la particion) del dispositivo.
+        name=os.path.basename(os.path.realpath(dev))
+        sysDev=os.path.realpath("/sys/class/block/%s" % name)
+        if(os.path.exists(os.path.join(sysDev,"partition"))):
+          name=os.path.basename(os.path.dirname(sysDev))
+        try:
+          with open("/sys/block/%s/queue/rotational" % name,"r") as f:
+            rotational=f.read().strip()=="1"
+        except IOError:
+          continue
+        if(name.startswith("nvme")):
+          kind="nvme"
+        elif(rotational):
+          kind="hdd"
+        else:
+          kind="ssd"
+      else:
+        continue
+      try:
+        st=os.statvfs(mnt)
+      except OSError:
+        continue
+      ret.append({"mount":mnt,"kind":kind,"free":(st.f_bavail*st.f_frsize)>>20})
+    return(ret)
+
+   # Tipo de almacenamiento (detectStorage) donde esta path, None si se desconoce.
+   def storageKind(self,path):
+    ret=None
+    best=""
+    for v in self.detectStorage(True):
+      mnt=v["mount"].rstrip("/")+"/"
+      if((path.rstrip("/")+"/").startswith(mnt) and len(mnt)>len(best)):
+        best=mnt
+        ret=v["kind"]
+    return(ret)
+
+   # Mayor velocidad (Mb/s) de las interfaces de red activas segun
+   #  /sys/class/net/*/speed, None si no se puede determinar.
+   def detectNicSpeed(self):
+    ret=None
+    try:
+      nics=os.listdir("/sys/class/net")
+    except OSError:
+      return(ret)
+    for nic in nics:
+      if(nic=="lo"):
+        continue
+      try:
+        with open("/sys/class/net/%s/speed" % nic,"r") as f:
+          speed=int(f.read().strip())
+      except (IOError,OSError,ValueError):
+        continue
+      if(speed>0 and (ret is None or speed>ret)):
+        ret=speed
+    return(ret)
+
+   # Version de cgroups con controlador de memoria disponible (v1, v2),
+   #  None si el equipo no soporta cgroups.
+   def detectCgroups(self):
+    try:
+      with open("/sys/fs/cgroup/cgroup.controllers","r") as f:
+        if("memory" in f.read().split()):
+          return("v2")
+    except IOError:
+      pass
+    if(os.path.isdir("/sys/fs/cgroup/memory")):
+      return("v1")
+    return(None)
+
+   # Red IPv4 de una entrada ALLOW_* (IP, IP con * final o CIDR), None si no es IP.
+   def allow2Net(self,var):
+    if(var.find("/")>0 or self.checkIpv4(var,True)):
+      try:
+        return ipaddress.ip_network(u"%s" % var,strict=False)
+      except ValueError:
+        return None
+    lst=var.split(".")
+    if(self.checkIpv4(var) and lst[-1]=="*" and "*" not in lst[:-1]):
+      fixed=lst[:-1]
+      return ipaddress.ip_network(u"%s/%s" % (".".join(fixed+["0"]*(4-len(fixed))),8*len(fixed)))
+    return None
+
+   # Entrada ALLOW_* de una red: IP, forma con * para /8, /16, /24 o CIDR.
+   def net2Allow(self,net):
+    if(net.prefixlen==32):
+      return "%s" % net.network_address
+    if(net.prefixlen in (8,16,24)):
+      return "%s.*" % ".".join(("%s" % net.network_address).split(".")[:net.prefixlen//8])
+    return "%s" % net
+
+   """
+    Compacta una lista de entradas ALLOW_*: elimina duplicados y
+    subdominios cubiertos por un *.dominio padre, y agrupa las IPs en los
+    bloques (* o CIDR) mas pequenos posibles sin cambiar lo permitido.
+   """
+   def aggregateAllow(self,entries):
+    other=[]
+    doms=[]
+    nets=[]
+    seen=set()
+    for e in entries:
+      e=e.strip()
+      if(not e):
+        continue
+      net=self.allow2Net(e)
+      if(net is not None):
+        nets.append(net)
+        continue
+      if(e.startswith("*.") or (self.checkDomain(e) and "*" not in e and "@" not in e)):
+        e=e.lower()
+        lst=doms
+      else:
+        lst=other
+      if(e not in seen):
+        seen.add(e)
+        lst.append(e)
+    wild=set([d[2:] for d in doms if d.startswith("*.")])
+    keep=[d for d in doms if not wild.intersection(self.domainParents(d[2:] if d.startswith("*.") else d))]
+    return(other+keep+[self.net2Allow(n) for n in ipaddress.collapse_addresses(nets)])
+
+   # Dominios padre de un nombre: a.b.c -> [b.c, c]
+   def domainParents(self,name):
+    lst=name.split(".")
+    return [".".join(lst[i:]) for i in range(1,len(lst))]
+
+   """
+    Indice de una lista ALLOW_* ya compactada, para saber con allowCovered
+    si una entrada ya es permitida sin recorrer la lista: nombres y
+    dominios *. en conjuntos, redes ordenadas por direccion inicial.
+   """
+   def allowIndex(self,current):
+    agg=self.aggregateAllow(current)
+    nets=[n for n in [self.allow2Net(e) for e in agg] if n is not None]
+    return {"names":set(agg),"wild":set([e[2:] for e in agg if e.startswith("*.")]),
+            "nets":nets,"starts":[int(n.network_address) for n in nets]}
+
+   # Verifica si la entrada ya es permitida por la lista indexada con allowIndex.
+   def allowCovered(self,index,entry):
+    entry=entry.strip()
+    net=self.allow2Net(entry)
+    if(net is not None):
+      # Las redes compactadas no se solapan: solo la anterior puede contenerla.
+      pos=bisect.bisect_right(index["starts"],int(net.network_address))-1
+      return pos>=0 and net.subnet_of(index["nets"][pos])
+    name=entry.lower()
+    if(entry in index["names"] or name in index["names"]):
+      return True
+    return len(index["wild"].intersection(self.domainParents(name[2:] if name.startswith("*.") else name)))>0
+
    def findStrConfig(self,config,searchStr):
     ret=False
     if(config.find(searchStr)!=-1):
       ret=True
     return(ret)
 
+   """
+    Leer inventario de nodos. Cada linea tiene la forma:
+      fqdn tipo [llave=valor ...]
+    donde tipo es m, s, e o ms. Lineas vacias y comentarios (#) se ignoran.
+    Retorna lista de diccionarios con fqdn, node y las llaves extra.
+   """
+   def readInventory(self,inputFile):
+    ret=[]
+    with open(inputFile,"r") as f:
+      for l in f:
+        l=l.split("#")[0].strip()
+        if(not l):
+          continue
+        lst=l.split()
+        node={"fqdn":lst[0].lower(),"node":lst[1] if len(lst)>1 else None}
+        for kv in lst[2:]:
+          if("=" in kv):
+            k,v=kv.split("=",1)
+            node[k]=v
+        ret.append(node)
+    return(ret)
+
+"""
+  Entrada de configuracion generada por una etapa cfg*: knob con valor y
+  comentario opcional, o bloque de texto (raw) con varios knobs. Usa
+  __slots__ y comparte (intern) knobs y comentarios, que se repiten en
+  cada nodo, para mantener en memoria las configuraciones de un pool.
+"""
+class ConfigEntry(object):
+  __slots__=("_key","value","_comment","raw","stage")
+
+  def __init__(self,key=None,value=None,comment=None,raw=None,stage=None):
+    self.key=key
+    self.value=value
+    self.comment=comment
+    self.raw=raw
+    self.stage=stage
+
+  # knob y comentario se comparten tambien si cambian despues de crear la entrada.
+  @property
+  def key(self):
+    return self._key
+
+  @key.setter
+  def key(self,key):
+    self._key=sys.intern(key) if key else key
+
+  @property
+  def comment(self):
+    return self._comment
+
+  @comment.setter
+  def comment(self,comment):
+    self._comment=sys.intern(comment) if comment else comment
+
+  # Diccionario para la salida estructurada (-of json).
+  def asDict(self):
+    return {"knob":self.key,"value":self.value,"comment":self.comment,"stage":self.stage}
+
 """
   Clase encargada de procesar los argumentos y realizar la configuracion o
   reconfiguracion de HTCondor en el equipo actual.
 """
 class Install(object):
   # Constructor, crea los mensajes y recolecta informacion
-  def __init__(self,args,name):
+  #  fqdn: generar la configuracion de ese nodo sin consultar el DNS.
+  def __init__(self,args,name,fqdn=None):
      # Lista para almacenar los errores encontrados
      self.errores=[]
      # Lista para almacenar el orden de las opciones
@@ -222,22 +485,39 @@ class Install(object):
      # self.configFile=""
      # Almacenar configuracion.
      self.config={}
+     # Modelo estructurado de la configuracion generada (ConfigEntry por knob)
+     self.model=[]
+     # Etapa (metodo cfg*) que se esta procesando.
+     self.stage=None
+     # Solo generar la configuracion (exportar), sin instalar scripts.
+     self.renderOnly=False
+     # Directorios a crear al guardar la configuracion (ej. EXECUTE de -fs).
+     self.dirs=[]
      # Almacenar nombre del programa
      self.name=name
      # Copiar argumentos a variable del objeto.
      self.args=args
-     # Obtener hostname
-     self.hostname=socket.gethostname().lower()
-     # Obtener fullhostname
-     self.fqdn=socket.getfqdn().lower()
-     # Obtener dominio basandose en el FQDN del equipo
-     self.domain=".".join(self.fqdn.split(".")[1::])
+     if(fqdn):
+       self.setHost(fqdn)
+     else:
+       # Obtener hostname
+       self.hostname=socket.gethostname().lower()
+       # Obtener fullhostname
+       self.fqdn=socket.getfqdn().lower()
+       # Obtener dominio basandose en el FQDN del equipo
+       self.domain=".".join(self.fqdn.split(".")[1::])
      # print self.domain
      # Fecha y hora en que se ejecuta instalador, usando time
-     self.hoy=strftime("%d/%m/%Y %H:%M:%S")
-     # Datos de configuracion.
-     self.configData="##### VALORES AGREGADOS POR %s el dia: %s #####" % (self.name,self.hoy)
-
+     self.setDate(strftime("%d/%m/%Y %H:%M:%S"))
+
+     # Knobs cuyo cambio requiere condor_restart, los demas solo condor_reconfig.
+     self.restart_knobs=[re.compile(r) for r in (
+       r"^DAEMON_LIST$",r"^USE_SHARED_PORT$",r"^SHARED_PORT_ARGS$",
+       r"^NETWORK_INTERFACE$",r"^BIND_ALL_INTERFACES$",r"^TCP_FORWARDING_HOST$",
+       r"^PRIVATE_NETWORK_INTERFACE$",r"^PRIVATE_NETWORK_NAME$",
+       r"^NUM_SLOTS$",r"^NUM_SLOTS_TYPE_\d+$",r"^SLOT_TYPE_\d+$",
+       r"^SLOT_TYPE_\d+_PARTITIONABLE$",r"^EXECUTE$",r"^NO_DNS$",
+       r"^BASE_CGROUP$",r"^CGROUP_MEMORY_LIMIT_POLICY$")]
      # Mensajes de error
      self.msgs_error={
        "err_task":"Task not defined (c/r) / Tarea no definida (c/r) ",
@@ -254,7 +534,27 @@ class Install(object):
        "err_masterslot":"-rs,-ds: Slots can't be created in Master or submit nodes / No se pueden crear slots en nodos maestro o de envio",
        "err_natip":"-nat: Invalid IP addresses / Direcciones IP no validas",
        "err_wrongowner":"-ou: Invalid owner\'s username / Nombre de propietario invalido",
-       "err_nofile":"File not found / Archivo no encontrado"}
+       "err_nofile":"File not found / Archivo no encontrado",
+       "err_limits":"-cl: Invalid concurrency limits, use NAME=N,NAME=N / Limites de concurrencia no validos, use NOMBRE=N,NOMBRE=N",
+       "err_nodns":"-nodns: Only for -nat or -rn nodes, needs the Central Manager IP (-cm IP with -nd, or 'ip=' in -inv) / Solo para nodos -nat o -rn, requiere la IP del Central Manager (-cm IP con -nd, o 'ip=' en -inv)",
+       "err_flock":"-ft,-ff: Invalid flocking hosts or domains / Hosts o dominios de flocking no validos",
+       "err_consumption":"-cp: Consumption policy requires a dynamic slot (-ds) / La politica de consumo requiere un slot dinamico (-ds)",
+       "err_cpnode":"-cp: Only for master or execute nodes (-nt m, ms, e) / Solo para nodos maestro o de ejecucion (-nt m, ms, e)",
+       "err_metrics":"-mx: Invalid exporter port or missing -stats / Puerto del exportador no valido o falta -stats",
+       "err_statsnode":"-stats: Missing node type (-nt) to choose the daemon statistics / Falta el tipo de nodo (-nt) para elegir las estadisticas de los demonios",
+       "err_shortjobs":"-sj: Only for execute or submit nodes, worklife must be greater than 0 / Solo para nodos de ejecucion o envio, el tiempo de vida debe ser mayor a 0",
+       "err_logbudget":"-lb: Log budget too small / Presupuesto de logs muy pequeno",
+       "err_lbnode":"-lb: Missing node type (-nt) to split the log budget by daemon / Falta el tipo de nodo (-nt) para repartir el presupuesto de logs por demonio",
+       "err_cgroupnode":"-cg: cgroup limits are only for execute nodes / Los limites con cgroups son solo para nodos de ejecucion",
+       "err_nocgroup":"-cg: cgroups with memory controller not found in /sys/fs/cgroup / No se encontro cgroups con controlador de memoria en /sys/fs/cgroup",
+       "err_nogroup":"-pg: Missing network group for this node / Falta el grupo de red de este nodo",
+       "err_ftpnode":"-ftp: File transfer profile only for submit nodes / Perfil de transferencia solo para nodos de envio",
+       "err_fastscratch":"-fs: Fast scratch is only for execute nodes / El directorio de trabajo rapido es solo para nodos de ejecucion",
+       "err_scratch":"-fs: No suitable local storage for jobs / No hay almacenamiento local adecuado para las tareas",
+       "err_dockerscratch":"-dsv: Invalid Docker scratch path / Ruta de trabajo para Docker no valida",
+       "err_cronname":"-cj,-cjf: Repeated cron job names / Nombres de tareas cron repetidos",
+       "err_ppnode":"-pp: Performance probe only for execute nodes (-nt e) / Sonda de rendimiento solo para nodos de ejecucion (-nt e)",
+       "err_cronjob":"-cj: Invalid cron job, use name script period args [Periodic|WaitForExit|OneShot] / Tarea cron no valida, use nombre script periodo argumentos [Periodic|WaitForExit|OneShot]"}
      # Verificar argumentos recibidos
      # self.checkArgs(args)
 
@@ -262,28 +562,204 @@ class Install(object):
   def config2Data(self,cfg_order,config):
     for item in cfg_order:
       try:
-        # Si es lista de ClassAd,Valor y Comentario
-        if(len(config[item])==3):
+        entry=config[item]
+        # Si es bloque de contenido
+        if(entry.raw is not None):
+          # Quitar los espacios sobrantes de cada linea.
+          for l in entry.raw.split("\n"):
+            self.configData+="%s\n" % (l.lstrip())
+          for knob,value,comm in self.data2Entries(entry.raw):
+            self.addModel(knob,value,comm)
+        # Si es ClassAd, Valor y Comentario
+        elif(entry.comment is not None):
           comm=""
           # Si el comentario es de mas de 80 caracteres
           # partirlo en 2 lineas.
-          if(len(config[item][2])>70):
-            commLst=config[item][2].split("/")
+          if(len(entry.comment)>70):
+            commLst=entry.comment.split("/")
             comm="%s\n#%s" % (commLst[0],commLst[1])
           else:
-            comm=config[item][2]
-          self.configData+="\n# %s\n%s = %s\n" % (comm,config[item][0],config[item][1])
-        # Si es lista de ClassAd y Valor
-        elif(len(config[item])==2):
-          self.configData+="%s = %s\n" % (config[item][0],config[item][1])
-        # Si es lista de contenido
+            comm=entry.comment
+          self.configData+="\n# %s\n%s = %s\n" % (comm,entry.key,entry.value)
+          entry.stage=self.stage
+          self.model.append(entry)
+        # Si es ClassAd y Valor
         else:
-          # Quitar los espacios sobrantes de cada linea.
-          for l in config[item][0].split("\n"):
-            self.configData+="%s\n" % (l.lstrip())
+          self.configData+="%s = %s\n" % (entry.key,entry.value)
+          entry.comment=""
+          entry.stage=self.stage
+          self.model.append(entry)
       except KeyError:  # si no esta la llave solicitada, no mostrar nada.
         pass
 
+  # Fecha de la configuracion y encabezado de los datos, None para omitirla
+  #  (configuraciones reproducibles).
+  def setDate(self,hoy):
+    self.hoy=hoy
+    if(hoy):
+      self.configData="##### VALORES AGREGADOS POR %s el dia: %s #####" % (self.name,hoy)
+    else:
+      self.configData="##### VALORES AGREGADOS POR %s #####" % self.name
+
+  # Usar fqdn como nombre del equipo, para generar la configuracion de otro nodo.
+  def setHost(self,fqdn):
+    self.fqdn=fqdn.lower()
+    self.hostname=self.fqdn.split(".")[0]
+    self.domain=".".join(self.fqdn.split(".")[1::])
+
+  # Nodos del inventario (-inv), leido una sola vez.
+  def inventoryNodes(self,valida):
+    if(not self.args.inventory):
+      return []
+    if(not hasattr(self,"inventory")):
+      self.inventory=valida.readInventory(self.args.inventory)
+    return self.inventory
+
+  # Datos de este equipo en el inventario (-inv), {} si no esta.
+  def inventoryNode(self,valida):
+    for node in self.inventoryNodes(valida):
+      if(node["fqdn"]==self.fqdn or node["fqdn"]==self.hostname):
+        return node
+    return {}
+
+  # Agregar una entrada al modelo estructurado.
+  def addModel(self,knob,value,comment):
+    self.model.append(ConfigEntry(knob,value,comment,stage=self.stage))
+
+  """
+   Convierte un bloque de texto de configuracion en lista de
+   (knob, valor, comentario). Los comentarios previos a cada knob se
+   asocian a este, las lineas en blanco los descartan.
+  """
+  def data2Entries(self,data):
+    ret=[]
+    comm=[]
+    lines=iter(data.split("\n"))
+    for l in lines:
+      l=l.strip()
+      if(not l):
+        comm=[]
+      elif(l.startswith("#")):
+        comm.append(l.lstrip("#").strip())
+      elif("=" in l):
+        knob,value=l.split("=",1)
+        knob=knob.strip()
+        value=value.strip()
+        # Valor multilinea: KNOB @=fin ... @fin
+        if(knob.endswith("@")):
+          knob=knob[:-1].strip()
+          tag="@%s" % value
+          body=[]
+          for b in lines:
+            if(b.strip()==tag):
+              break
+            body.append(b.strip())
+          value="\n".join(body)
+        ret.append((knob,value," ".join(comm)))
+        comm=[]
+    return(ret)
+
+  """
+   Valores efectivos de un texto de configuracion: la ultima asignacion
+   de cada knob gana y $(KNOB) dentro de su propio valor se reemplaza por
+   el valor anterior, como lo hace HTCondor. Retorna {KNOB: (knob, valor)}.
+  """
+  def effectiveConfig(self,data):
+    ret={}
+    for knob,value,comm in self.data2Entries(data):
+      key=knob.upper()
+      prev=ret[key][1] if key in ret else ""
+      value=re.sub(r"\$\(%s\)" % re.escape(knob),lambda m: prev,value,flags=re.I)
+      ret[key]=(knob,value)
+    return(ret)
+
+  """
+   Valor de un knob en este equipo: del archivo -cf y lo ya generado si no
+   usa macros, si no de condor_config_val, y default si ninguno lo tiene.
+  """
+  def condorValue(self,knob,default):
+    data=self.configData
+    if(self.args.config and os.path.isfile(self.args.config)):
+      with open(self.args.config,"r") as f:
+        data="%s\n\n%s" % (f.read(),data)
+    cfg=self.effectiveConfig(data)
+    if(knob in cfg and cfg[knob][1] and "$(" not in cfg[knob][1]):
+      return cfg[knob][1]
+    try:
+      value=subprocess.check_output(["condor_config_val",knob],timeout=30).decode("utf-8","replace").strip()
+      if(value):
+        return value
+    except (OSError,subprocess.SubprocessError):
+      pass
+    return default
+
+  # Clasificar un knob modificado.
+  def knobAction(self,knob):
+    for r in self.restart_knobs:
+      if(r.match(knob.upper())):
+        return "restart"
+    return "reconfig"
+
+  """
+   Comparar la configuracion generada con la del archivo actual,
+   clasificar cada knob como restart, reconfig o no-op y mostrar la
+   accion mas barata que aplica los cambios.
+  """
+  def diffConfig(self,valida):
+    old=""
+    if(os.path.isfile(self.args.config)):
+      with open(self.args.config,"r") as f:
+        old=f.read()
+    if(self.args.task=="r"):
+      new="%s\n\n%s" % (old,self.configData)
+    else:
+      new=self.configData
+    oldCfg=self.effectiveConfig(old)
+    newCfg=self.effectiveConfig(new)
+    rendered=set([e.key.upper() for e in self.model])
+    changes={"restart":[],"reconfig":[],"no-op":[]}
+    for key in sorted(set(oldCfg)|set(newCfg)):
+      oldVal=oldCfg[key][1] if key in oldCfg else None
+      newVal=newCfg[key][1] if key in newCfg else None
+      knob=newCfg[key][0] if key in newCfg else oldCfg[key][0]
+      if(oldVal==newVal):
+        if(key in rendered):
+          changes["no-op"].append((knob,oldVal,newVal))
+      else:
+        changes[self.knobAction(knob)].append((knob,oldVal,newVal))
+    for kind in ("restart","reconfig","no-op"):
+      for knob,oldVal,newVal in changes[kind]:
+        print("[%s] %s: %s -> %s" % (kind,knob,oldVal,newVal))
+    if(changes["restart"]):
+      action="condor_restart"
+    elif(changes["reconfig"]):
+      action="condor_reconfig"
+    else:
+      action="none"
+    print("----- Action/Accion: %s (restart: %s, reconfig: %s, no-op: %s) -----" % (action,len(changes["restart"]),len(changes["reconfig"]),len(changes["no-op"])))
+    return(action)
+
+  # Escapar cadena para un ClassAd.
+  def classAdStr(self,var):
+    return "\"%s\"" % ("%s" % var).replace("\\","\\\\").replace("\"","\\\"").replace("\n","\\n")
+
+  # Modelo como JSON.
+  def model2Json(self):
+    return json.dumps({"host":self.fqdn,"date":self.hoy,"entries":[e.asDict() for e in self.model]},indent=1)
+
+  # Modelo como ClassAds (formato largo, un ClassAd por entrada).
+  def model2ClassAd(self):
+    ads=[]
+    for e in self.model:
+      ads.append("Host = %s\nKnob = %s\nValue = %s\nComment = %s\nStage = %s\n" % (self.classAdStr(self.fqdn),\
+        self.classAdStr(e.key),self.classAdStr(e.value),self.classAdStr(e.comment),self.classAdStr(e.stage)))
+    return "\n".join(ads)
+
+  # Entero deterministico derivado del FQDN del equipo y salt.
+  # Permite generar valores distintos por nodo pero reproducibles.
+  def hostHash(self,salt):
+    return int(hashlib.sha256(("%s:%s" % (self.fqdn,salt)).encode("utf-8")).hexdigest()[:8],16)
+
   # Metodo que evalua si se puede o no continuar la ejecucion
   def checkErrors(self):
      if len(self.errores)>0:
@@ -331,43 +807,46 @@ class Install(object):
         return(ret)
       # Si es configuracion se definen estas classads.
       if(args.domain):
-        config["cfg_admin"]=["CONDOR_ADMIN","root@$(FULL_HOSTNAME)","Contact's email / email de contacto"]
-        config["cfg_uid"]=["UID_DOMAIN","%s" % args.domain,"User ID Domain"]
-        config["cfg_fs"]=["FILESYSTEM_DOMAIN","%s" % args.domain,"Filesystem Domain"]
+        config["cfg_admin"]=ConfigEntry("CONDOR_ADMIN","root@$(FULL_HOSTNAME)","Contact's email / email de contacto")
+        config["cfg_uid"]=ConfigEntry("UID_DOMAIN","%s" % args.domain,"User ID Domain")
+        config["cfg_fs"]=ConfigEntry("FILESYSTEM_DOMAIN","%s" % args.domain,"Filesystem Domain")
       elif(args.masterdomain):
-        config["cfg_admin"]=["CONDOR_ADMIN","root@$(FULL_HOSTNAME)","Contact's email / email de contacto"]
-        config["cfg_uid"]=["UID_DOMAIN","%s" % args.masterdomain,"User ID Domain"]
-        config["cfg_fs"]=["FILESYSTEM_DOMAIN","%s" % args.masterdomain,"Filesystem Domain"]
+        config["cfg_admin"]=ConfigEntry("CONDOR_ADMIN","root@$(FULL_HOSTNAME)","Contact's email / email de contacto")
+        config["cfg_uid"]=ConfigEntry("UID_DOMAIN","%s" % args.masterdomain,"User ID Domain")
+        config["cfg_fs"]=ConfigEntry("FILESYSTEM_DOMAIN","%s" % args.masterdomain,"Filesystem Domain")
       elif(self.domain):
-        config["cfg_admin"]=["CONDOR_ADMIN","root@$(FULL_HOSTNAME)","Contact's email / email de contacto"]
-        config["cfg_uid"]=["UID_DOMAIN","%s" % self.domain,"User ID Domain"]
-        config["cfg_fs"]=["FILESYSTEM_DOMAIN","%s" % self.domain,"Filesystem Domain"]
+        config["cfg_admin"]=ConfigEntry("CONDOR_ADMIN","root@$(FULL_HOSTNAME)","Contact's email / email de contacto")
+        config["cfg_uid"]=ConfigEntry("UID_DOMAIN","%s" % self.domain,"User ID Domain")
+        config["cfg_fs"]=ConfigEntry("FILESYSTEM_DOMAIN","%s" % self.domain,"Filesystem Domain")
 
     # Nodo maestro
     if(args.node=="m" or args.node=="ms"):
       # define rank to use local nodes first and remotes last.
-      config["cfg_rank"]=["NEGOTIATOR_PRE_JOB_RANK","(IsRemote =!= True && isUndefined(RemoteOwner)) + isUndefined(RemoteOwner)","Use local and free nodes 1st / Usar nodos locales y libres primero"]
+      config["cfg_rank"]=ConfigEntry("NEGOTIATOR_PRE_JOB_RANK","(IsRemote =!= True && isUndefined(RemoteOwner)) + isUndefined(RemoteOwner)","Use local and free nodes 1st / Usar nodos locales y libres primero")
+      if(args.perfrank):  # Preferir nodos rapidos (PerfScore de htprobe.py), siempre menor a 1.
+        config["cfg_rank"].value="%s + ifThenElse(isUndefined(MY.MY_PerfScore),0,MY.MY_PerfScore/(MY.MY_PerfScore+100.0))" % config["cfg_rank"].value
+        config["cfg_rank"].comment="Use local, free and fast nodes 1st / Usar nodos locales, libres y rapidos primero"
       if(args.node=="m"):
-        config["cfg_type"]=["DAEMON_LIST","MASTER,COLLECTOR,NEGOTIATOR","Type: Condor Master"]
+        config["cfg_type"]=ConfigEntry("DAEMON_LIST","MASTER,COLLECTOR,NEGOTIATOR","Type: Condor Master")
       elif(args.node=="ms"):
-        config["cfg_type"]=["DAEMON_LIST","MASTER,COLLECTOR,NEGOTIATOR,SCHEDD","Type: Condor Master & Schedd"]
+        config["cfg_type"]=ConfigEntry("DAEMON_LIST","MASTER,COLLECTOR,NEGOTIATOR,SCHEDD","Type: Condor Master & Schedd")
       if(args.usesp):  # Se solicito shared_port, anexar el servicio.
-        config["cfg_type"][1]="%s,SHARED_PORT" % config["cfg_type"][1]
+        config["cfg_type"].value="%s,SHARED_PORT" % config["cfg_type"].value
       # Se indico un dominio diferente.
       if(args.domain and valida.checkDomain(args.domain)):
-        config["cfg_master"]=["CONDOR_HOST","$(FULL_HOSTNAME)","Condor Master"]
+        config["cfg_master"]=ConfigEntry("CONDOR_HOST","$(FULL_HOSTNAME)","Condor Master")
       # No se indico dominio, usar el FQDN del equipo.
       elif(args.task=="c" and valida.checkFqdn(self.fqdn)):
-        config["cfg_master"]=["CONDOR_HOST","$(FULL_HOSTNAME)","Condor Master"]
+        config["cfg_master"]=ConfigEntry("CONDOR_HOST","$(FULL_HOSTNAME)","Condor Master")
       else:
         self.errores.append("err_wrongdomain")
         ret=False
     # Nodos no maestro.
     else:
       if(args.node=="s"):  # Submit node
-        config["cfg_type"]=["DAEMON_LIST","MASTER,SCHEDD","Type: Condor Scheduller"]
+        config["cfg_type"]=ConfigEntry("DAEMON_LIST","MASTER,SCHEDD","Type: Condor Scheduller")
       elif(args.node=="e"):  # Execute node
-        config["cfg_type"]=["DAEMON_LIST","MASTER,STARTD","Type: Condor Worker"]
+        config["cfg_type"]=ConfigEntry("DAEMON_LIST","MASTER,STARTD","Type: Condor Worker")
       # No se indico tipo de nodo y es configuracion.
       elif(args.task=="c"):
         self.errores.append("err_nodetype")
@@ -375,11 +854,12 @@ class Install(object):
 
       # Se indico tipo de nodo y shared_port, anexar el servicio.
       if(args.usesp and args.node):
-        config["cfg_type"][1]="%s,SHARED_PORT" % config["cfg_type"][1]
+        config["cfg_type"].value="%s,SHARED_PORT" % config["cfg_type"].value
       # Verificar que el master indicado si es un FQDN.
       if(args.master and valida.checkFqdn(args.master)):
-        config["cfg_master"]=["CONDOR_HOST","%s" % args.master,"Condor Master"]
-        if(not args.domain or (args.domain and not valida.checkDomain(args.domain))):
+        # Con -nodns el Central Manager se indica por IP.
+        config["cfg_master"]=ConfigEntry("CONDOR_HOST","%s" % ((args.nodns and self.masterIp(valida)) or args.master),"Condor Master")
+        if(args.masterdomain and (not args.domain or not valida.checkDomain(args.domain))):
           args.domain=args.masterdomain
       # Si es configuracion debe haber master,
       #  si es reconfig y se indico tipo de nodo, debe haber un master.
@@ -388,7 +868,7 @@ class Install(object):
         ret=False
 
     if(args.swap):  # Deshabilitar swap.
-      config["cfg_swap"]=["RESERVED_SWAP","0","Deshabilitar uso de Swap / Disable Swap use."]
+      config["cfg_swap"]=ConfigEntry("RESERVED_SWAP","0","Deshabilitar uso de Swap / Disable Swap use.")
 
     if(ret):
       cfg_order.append("cfg_master")
@@ -403,50 +883,56 @@ class Install(object):
       # Actualizar argumentos
       self.args=args
 
+  # Convierte lista de dominios/IPs separados por coma en entradas de ALLOW_*:
+  #  las IP se mantienen y los dominios se convierten en *.dominio.
+  def domains2Allow(self,valida,domains):
+    ret=[]
+    for dom in domains.split(","):
+      dom=dom.strip()
+      if(valida.checkIpv4(dom)):
+        ret.append("%s" % dom)
+      elif(valida.checkDomain(dom)):
+        ret.append("*.%s" % dom)
+    return(ret)
+
   # Crea el allow_write.
   def cfgAllow(self,valida):
     args=self.args
     ret=False
     cfg_order=[]
     config={}
-    # Se indico un master
-    if(args.master):
+    # Se indico un master por nombre
+    if(args.master and args.masterdomain):
       ret=True
       # Se indico un master y un dominio diferente al del master
       if(args.masterdomain!=args.domain and valida.checkDomain(args.domain)):
-        config["cfg_write"]=["ALLOW_WRITE","*.%s,*.%s" % (args.domain,args.masterdomain),"Allowed computers / Equipos permitidos"]
+        config["cfg_write"]=ConfigEntry("ALLOW_WRITE","*.%s,*.%s" % (args.domain,args.masterdomain),"Allowed computers / Equipos permitidos")
       else:
-        config["cfg_write"]=["ALLOW_WRITE","*.%s" % (args.masterdomain),"Allowed computers / Equipos permitidos"]
+        config["cfg_write"]=ConfigEntry("ALLOW_WRITE","*.%s" % (args.masterdomain),"Allowed computers / Equipos permitidos")
     # No se indico master pero si un dominio.
     elif(args.domain and valida.checkDomain(args.domain)):
       ret=True
-      config["cfg_write"]=["ALLOW_WRITE","*.%s" % (args.domain),"Allowed computers / Equipos permitidos"]
+      config["cfg_write"]=ConfigEntry("ALLOW_WRITE","*.%s" % (args.domain),"Allowed computers / Equipos permitidos")
     # No se indico master ni dominios, pero el equipo tiene dominio valido.
     elif(args.task=="c" and valida.checkDomain(self.domain)):
       ret=True
-      config["cfg_write"]=["ALLOW_WRITE","*.%s" % (self.domain),"Allowed computers / Equipos permitidos"]
+      config["cfg_write"]=ConfigEntry("ALLOW_WRITE","*.%s" % (self.domain),"Allowed computers / Equipos permitidos")
     # No se indicaron master, dominio o dominios.
     elif(args.task=="c"):
       self.errores.append("err_wrongdomain")
       ret=False
     # No se indico master ni dominio, pero si dominios.
     if(args.domains):
-      dominios=[]
-      doms=args.domains.split(",")
-      for dom in doms:
-        if(valida.checkIpv4(dom)):
-          dominios.append("%s" % dom)
-        elif(valida.checkDomain(dom)):
-          dominios.append("*.%s" % dom)
+      dominios=self.domains2Allow(valida,args.domains)
       # Hay dominios y se indico master o dominio tambien.
-      if(len(dominios)>0 and ("cfg_write" in config and len(config["cfg_write"])>1)):
+      if(len(dominios)>0 and ("cfg_write" in config and config["cfg_write"].value is not None)):
         ret=True
-        config["cfg_write"][1]="%s,%s" % (config["cfg_write"][1],",".join(dominios))
+        config["cfg_write"].value="%s,%s" % (config["cfg_write"].value,",".join(dominios))
       # Solo se indicaron dominios.
       elif(len(dominios)>0):
         ret=True
-        config["cfg_write"]=["ALLOW_WRITE","%s" % (",".join(dominios)),"Allowed computers / Equipos permitidos"]
-        config["cfg_allow"]=["""
+        config["cfg_write"]=ConfigEntry("ALLOW_WRITE","%s" % (",".join(dominios)),"Allowed computers / Equipos permitidos")
+        config["cfg_allow"]=ConfigEntry(raw="""
           # Allow connetions from ALLOW_WRITE domains/PCs.
           # Permitir conexiones desde los domininio y PCs en ALLOW_WRITE
           UPDATE_STARTD_AD=$(ALLOW_WRITE)
@@ -454,14 +940,36 @@ class Install(object):
           ALLOW_ADVERTISE_MASTER = $(ALLOW_WRITE)
           ALLOW_ADVERTISE_STARTD = $(ALLOW_WRITE)
           #ALLOW_ADVERTISE_SCHEDD = $(ALLOW_WRITE)
-         """]
+         """)
       else:
         self.errores.append("err_domains")
         ret=False
 
-    if(args.task=="r" and ret):
-      config["cfg_write"][1]="$(ALLOW_WRITE),%s" % config["cfg_write"][1]
-      config["cfg_allow"]=["""
+    # Compactar la lista: sin duplicados, subdominios cubiertos ni IPs sueltas.
+    if(ret and "cfg_write" in config):
+      entries=config["cfg_write"].value.split(",")
+      # En reconfiguracion omitir lo que el archivo actual ya permite,
+      #  para que ALLOW_WRITE no crezca en cada ejecucion.
+      if(args.task=="r"):
+        current={}
+        if(os.path.isfile(args.config)):
+          with open(args.config,"r") as f:
+            current=self.effectiveConfig(f.read())
+        current=current["ALLOW_WRITE"][1].split(",") if "ALLOW_WRITE" in current else []
+        index=valida.allowIndex(current)
+        entries=[e for e in entries if not valida.allowCovered(index,e)]
+        ret=len(entries)>0
+      agg=valida.aggregateAllow(entries)
+      config["cfg_write"].value=",".join(agg)
+      if(len(agg)<len(entries)):
+        config["cfg_write"].comment="Allowed computers, %s -> %s entries / Equipos permitidos, %s -> %s entradas" % (len(entries),len(agg),len(entries),len(agg))
+
+    # Con -nodns, cfgNoDns crea ALLOW_WRITE solo con IPs.
+    if(ret and args.nodns):
+      config.pop("cfg_write",None)
+    elif(args.task=="r" and ret):
+      config["cfg_write"].value="$(ALLOW_WRITE),%s" % config["cfg_write"].value
+      config["cfg_allow"]=ConfigEntry(raw="""
         # Allow connetions from ALLOW_WRITE domains/PCs.
         # Permitir conexiones desde los domininio y PCs en ALLOW_WRITE
         UPDATE_STARTD_AD=$(ALLOW_WRITE)
@@ -469,7 +977,7 @@ class Install(object):
         ALLOW_ADVERTISE_MASTER = $(ALLOW_WRITE)
         ALLOW_ADVERTISE_STARTD = $(ALLOW_WRITE)
         #ALLOW_ADVERTISE_SCHEDD = $(ALLOW_WRITE)
-      """]
+      """)
     if(ret):
       cfg_order.append("cfg_write")
       cfg_order.append("cfg_allow")
@@ -487,13 +995,13 @@ class Install(object):
       # Validar que ambas IPs estan  completas.
       if(valida.checkIpv4(args.nodeips[0],True) and valida.checkIpv4(args.nodeips[1],True)):
         ret=True
-        config["cfg_nat"]=["""
+        config["cfg_nat"]=ConfigEntry(raw="""
         # Node's IP outside NAT/IP del nodo fuera del NAT
         TCP_FORWARDING_HOST=%s
         # Node IP inside NAT/IP del nodo en el NAT
         PRIVATE_NETWORK_INTERFACE=%s
         # NAT's domain/Dominio del NAT"
-        PRIVATE_NETWORK_NAME=$(UID_DOMAIN)""" % (args.nodeips[0],args.nodeips[1])]
+        PRIVATE_NETWORK_NAME=$(UID_DOMAIN)""" % (args.nodeips[0],args.nodeips[1]))
       else:
         self.errores.append("err_natip")
         ret=False
@@ -505,6 +1013,51 @@ class Install(object):
       # Crear contenido
       self.config2Data(cfg_order,config)
 
+  # IP del Central Manager: -cm si es IP o la llave ip= del inventario.
+  def masterIp(self,valida):
+    if(valida.checkIpv4(self.args.master,True)):
+      return self.args.master
+    for node in self.inventoryNodes(valida):
+      if(node["fqdn"]==(self.args.master or "").lower() and valida.checkIpv4(node.get("ip"),True)):
+        return node["ip"]
+    return None
+
+  """
+   Evitar consultas DNS en nodos tras NAT o remotos: NO_DNS, dominio por
+   defecto y reglas ALLOW con las IPs del inventario (llave ip=); el
+   Central Manager por IP lo escribe cfgBegin.
+  """
+  def cfgNoDns(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    if(args.nodns):
+      hosts=dict((n["fqdn"],n["ip"]) for n in self.inventoryNodes(valida) if valida.checkIpv4(n.get("ip"),True))
+      masterip=self.masterIp(valida)
+      # Con -cm IP el dominio debe indicarse con -nd.
+      domain=args.domain or args.masterdomain
+      if((args.nodeips or args.rn) and masterip and valida.checkDomain(domain)):
+        ret=True
+        ips=[masterip]+sorted(hosts.values())
+        if(args.nodeips):
+          ips+=args.nodeips
+        if(args.domains):
+          ips+=[d for d in self.domains2Allow(valida,args.domains) if valida.allow2Net(d) is not None]
+        config["cfg_nodns"]=ConfigEntry("NO_DNS","True","Don't use DNS, hostnames are derived from IPs / No usar DNS, los nombres se derivan de las IP")
+        config["cfg_nodnsdomain"]=ConfigEntry("DEFAULT_DOMAIN_NAME","%s" % domain,"Domain for IP derived hostnames / Dominio de los nombres derivados de IP")
+        config["cfg_nodnswrite"]=ConfigEntry("ALLOW_WRITE",",".join(valida.aggregateAllow(ips)),"Allowed IPs (%s hosts) / IPs permitidas (%s hosts)" % (len(hosts),len(hosts)))
+        if(args.task=="r"):
+          config["cfg_nodnswrite"].value="$(ALLOW_WRITE),%s" % config["cfg_nodnswrite"].value
+      else:
+        self.errores.append("err_nodns")
+        ret=False
+
+    if(ret):
+      cfg_order+=["cfg_nodns","cfg_nodnsdomain","cfg_nodnswrite"]
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
   # Habilitar restriccion de uso de IP.
   def cfgIp(self,valida):
     args=self.args
@@ -515,7 +1068,7 @@ class Install(object):
     if(args.ip):
       if(valida.checkIpv4(args.ip,True)):  # Validar que es una IP completa.
         ret=True
-        config["cfg_ip"]=["NETWORK_INTERFACE","%s" % args.ip,"IP to use/IP a usar"]
+        config["cfg_ip"]=ConfigEntry("NETWORK_INTERFACE","%s" % args.ip,"IP to use/IP a usar")
       else:
         self.errores.append("err_ip")
         ret=False
@@ -534,17 +1087,17 @@ class Install(object):
     # Se solicito habilitar SharedPort
     if(args.usesp):
       ret=True
-      config["cfg_port1"]=["USE_SHARED_PORT","True","Enable use a Shared port / Habilitar uso de un Shared Port"]
+      config["cfg_port1"]=ConfigEntry("USE_SHARED_PORT","True","Enable use a Shared port / Habilitar uso de un Shared Port")
 
     # Se solicito habilitar SharedPort
     if(args.sport and valida.checkInt(args.sport)):
       ret=True
       if(args.usesp):  # Se indico usar shared_port
-        config["cfg_port2"]=["SHARED_PORT_ARGS","-p %s" % args.sport,"Processes different than Collector use port %s/ Procesos diferentes al Collector usar puerto %s" %(args.sport,args.sport)]
+        config["cfg_port2"]=ConfigEntry("SHARED_PORT_ARGS","-p %s" % args.sport,"Processes different than Collector use port %s/ Procesos diferentes al Collector usar puerto %s" %(args.sport,args.sport))
       else:  # No se indico usar shared_port
         args.usesp=True
-        config["cfg_port1"]=["USE_SHARED_PORT","True","Enable use a Shared port / Habilitar uso de un Shared Port"]
-        config["cfg_port2"]=["SHARED_PORT_ARGS","-p %s" % args.sport,"Processes different to Collector use port %s/ Procesos diferentes a Collector usar puerto %s" %(args.sport,args.sport)]
+        config["cfg_port1"]=ConfigEntry("USE_SHARED_PORT","True","Enable use a Shared port / Habilitar uso de un Shared Port")
+        config["cfg_port2"]=ConfigEntry("SHARED_PORT_ARGS","-p %s" % args.sport,"Processes different to Collector use port %s/ Procesos diferentes a Collector usar puerto %s" %(args.sport,args.sport))
     elif(args.sport and not valida.checkInt(args.sport)):
       self.errores.append("err_port")
       ret=False
@@ -564,13 +1117,206 @@ class Install(object):
     # Se solicito habilitar SharedPort
     if(args.usetcp):
       ret=True
-      config["cfg_tcp"]=["UPDATE_COLLECTOR_WITH_TCP","True","Use TCP to Collector connections / Usar TCP para conexion con el Collector."]
+      config["cfg_tcp"]=ConfigEntry("UPDATE_COLLECTOR_WITH_TCP","True","Use TCP to Collector connections / Usar TCP para conexion con el Collector.")
 
     if(ret and args.usetcp):
       cfg_order.append("cfg_tcp")
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
 
+  # Limitar recursos de las tareas con cgroups en lugar de expresiones.
+  def cfgCgroup(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    if(args.task=="c" and args.cgroups and args.node!="e"):
+      self.errores.append("err_cgroupnode")
+    elif(args.cgroups):
+      version=valida.detectCgroups()
+      if(version):
+        ret=True
+        config["cfg_cgroup"]=ConfigEntry(raw="""
+        # Kernel (cgroup %s) memory enforcement / Limite de memoria por el kernel (cgroup %s)
+        BASE_CGROUP = htcondor
+        CGROUP_MEMORY_LIMIT_POLICY = hard""" % (version,version))
+      else:
+        self.errores.append("err_nocgroup")
+
+    if(ret):
+      cfg_order.append("cfg_cgroup")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
+  # Limitar el tamano y rotacion de los logs segun presupuesto de disco.
+  def cfgLogBudget(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    # Demonios por tipo de nodo: (demonio, archivo de log, peso, ruidoso)
+    daemons={"m":[("MASTER","MasterLog",1,False),("COLLECTOR","CollectorLog",3,False),("NEGOTIATOR","NegotiatorLog",3,True)],
+             "s":[("MASTER","MasterLog",1,False),("SCHEDD","SchedLog",3,False),("SHADOW","ShadowLog",4,True)],
+             "e":[("MASTER","MasterLog",1,False),("STARTD","StartLog",3,False),("STARTER","StarterLog",4,True)]}
+    daemons["ms"]=daemons["m"]+daemons["s"][1:]
+    # Sin tipo de nodo no se sabe que demonios escriben logs.
+    if(args.logbudget and args.node not in daemons):
+      self.errores.append("err_lbnode")
+    elif(args.logbudget):
+      if(args.logbudget>=len(daemons[args.node])):
+        ret=True
+        lst=daemons[args.node]
+        total=sum([d[2] for d in lst])
+        block=["# Log I/O budget %s MB / Presupuesto de I/O de logs %s MB" % (args.logbudget,args.logbudget)]
+        for daemon,name,weight,chatty in lst:
+          # Archivo actual mas 2 rotados dentro de la porcion del demonio.
+          size=(args.logbudget*weight<<20)//(total*3)
+          block.append("MAX_%s_LOG = %s" % (daemon,size))
+          block.append("MAX_NUM_%s_LOG = 2" % daemon)
+          if(chatty and args.logtmpfs):
+            block.append("%s_LOG = %s/condor_%s" % (daemon,args.logtmpfs.rstrip("/"),name))
+        config["cfg_logs"]=ConfigEntry(raw="\n%s" % "\n".join(block))
+      else:
+        self.errores.append("err_logbudget")
+
+    if(ret):
+      cfg_order.append("cfg_logs")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
+  """
+   Publicar estadisticas de los demonios de cada tipo de nodo y, con -mx,
+   ejecutar htexporter.py bajo condor_master para exponerlas en formato
+   Prometheus.
+  """
+  def cfgStatistics(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    levels={"basic":1,"detail":2}
+    # Categorias y fuentes del exportador por tipo de nodo.
+    cats={"m":["COLLECTOR","NEGOTIATOR"],"s":["SCHEDD","TRANSFER"],"e":[]}
+    cats["ms"]=cats["m"]+cats["s"]
+    sources={"m":"-d collector,negotiator","s":"-af $(SCHEDD_DAEMON_AD_FILE)","e":"-af $(STARTD_DAEMON_AD_FILE)"}
+    sources["ms"]="%s %s" % (sources["m"],sources["s"])
+    # Sin tipo de nodo no se sabe que demonios publican estadisticas.
+    if(args.stats and args.node not in cats):
+      self.errores.append("err_statsnode")
+    elif(args.stats):
+      ret=True
+      lvl=levels[args.stats]
+      config["cfg_statspub"]=ConfigEntry("STATISTICS_TO_PUBLISH"," ".join(["DC:%s" % lvl]+["%s:%s" % (c,lvl) for c in cats[args.node]]),"Daemon statistics to publish / Estadisticas de demonios a publicar")
+      # Ventana mas corta y con mas resolucion en nivel detail.
+      if(lvl>1):
+        config["cfg_statswin"]=ConfigEntry(raw="""
+          # Statistics window / Ventana de estadisticas
+          STATISTICS_WINDOW_SECONDS = 600
+          STATISTICS_WINDOW_QUANTUM = 60""")
+      else:
+        config["cfg_statswin"]=ConfigEntry("STATISTICS_WINDOW_SECONDS","1200","Statistics window / Ventana de estadisticas")
+      if(args.node in ("m","ms")):
+        config["cfg_statsm"]=ConfigEntry(raw="""
+          # Collector update rates per daemon and last negotiation cycles
+          # Tasa de actualizaciones al Collector por demonio y ultimos ciclos de negociacion
+          COLLECTOR_DAEMON_STATS = True
+          COLLECTOR_DAEMON_HISTORY_SIZE = 128
+          NEGOTIATOR_NUM_CYCLE_STATS = %s""" % (5*lvl))
+      if(args.node in ("s","ms")):
+        config["cfg_statss"]=ConfigEntry("SCHEDD_COLLECT_STATS_BY_Owner","Owner","Schedd statistics per user / Estadisticas del Schedd por usuario")
+    # Con -stats sin tipo de nodo el error ya se reporto.
+    if(args.metrics is not None and (ret or not args.stats)):
+      if(ret and args.metrics>0 and args.metrics<65536):
+        path=self.installScript("htexporter.py")
+        if(path):
+          config["cfg_exporter"]=ConfigEntry(raw="""
+            # Prometheus metrics exporter run by condor_master
+            # Exportador de metricas Prometheus ejecutado por condor_master
+            HTEXPORTER = %s
+            HTEXPORTER_ARGS = -p %s %s
+            DAEMON_LIST = $(DAEMON_LIST) HTEXPORTER""" % (path,args.metrics,sources[args.node]))
+        else:
+          ret=False
+      else:
+        self.errores.append("err_metrics")
+        ret=False
+
+    if(ret):
+      cfg_order+=["cfg_statspub","cfg_statswin","cfg_statsm","cfg_statss","cfg_exporter"]
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
+  # Ajustar la cola de transferencia de archivos a la red y el disco.
+  def cfgTransfer(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    if(args.task=="c" and args.ftprofile is not None and args.node!="s" and args.node!="ms"):
+      self.errores.append("err_ftpnode")
+    elif(args.ftprofile is not None):
+      ret=True
+      # Velocidad indicada o detectada, 1Gb/s si no se puede detectar.
+      nic=args.ftprofile or valida.detectNicSpeed() or 1000
+      disk=valida.storageKind(self.condorValue("SPOOL","/var/lib/condor/spool")) or "hdd"
+      # Discos rotacionales soportan pocas transferencias concurrentes.
+      if(disk=="hdd"):
+        streams=min(10,max(2,nic//200))
+        throttle="2.0"
+      else:
+        streams=min(100,max(4,nic//100))
+        throttle="8.0" if disk=="ssd" else "16.0"
+      config["cfg_ftp"]=ConfigEntry(raw="""
+        # File transfer profile for %s Mb/s network and %s spool / Perfil de transferencia para red de %s Mb/s y spool en %s
+        MAX_CONCURRENT_UPLOADS = %s
+        MAX_CONCURRENT_DOWNLOADS = %s
+        # Limit concurrent transfers by disk load / Limitar transferencias concurrentes segun carga del disco
+        FILE_TRANSFER_DISK_LOAD_THROTTLE = %s
+        # Give up transfers waiting more than 1 hour in queue / Abandonar transferencias con mas de 1 hora en cola
+        MAX_TRANSFER_QUEUE_AGE = 3600""" % (nic,disk,nic,disk,streams,streams,throttle))
+
+    if(ret):
+      cfg_order.append("cfg_ftp")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
+  # Ubicar EXECUTE en el almacenamiento local mas rapido.
+  def cfgScratch(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    # Orden de preferencia de los tipos de almacenamiento.
+    speed={"tmpfs":4,"nvme":3,"ssd":2,"hdd":1}
+    if(args.task=="c" and args.fastscratch and args.node!="e"):
+      self.errores.append("err_fastscratch")
+    elif(args.fastscratch):
+      vols=[v for v in valida.detectStorage(args.fstmpfs) if v["free"]>=args.fastscratch*1024]
+      if(vols):
+        ret=True
+        best=max(vols,key=lambda v:(speed[v["kind"]],v["free"]))
+        # Si el mas rapido es la raiz se mantiene el EXECUTE por defecto.
+        if(best["mount"]!="/"):
+          execute=os.path.join(best["mount"],"condor","execute")
+          config["cfg_execute"]=ConfigEntry("EXECUTE",execute,"Jobs directory on %s (%s, %s MB free) / Directorio de tareas en %s (%s, %s MB libres)" % \
+            (best["mount"],best["kind"],best["free"],best["mount"],best["kind"],best["free"]))
+          # Se crea al guardar, si la configuracion no tiene errores.
+          self.dirs.append(execute)
+        # Tamano de tarea por defecto: espacio libre repartido entre los cores.
+        if(not args.ajs):
+          args.ajs=int(best["free"]//valida.detectCPUs())
+        # Aislar /tmp y /var/tmp de cada tarea dentro de su directorio.
+        if(args.fsisolation):
+          config["cfg_isolation"]=ConfigEntry("MOUNT_UNDER_SCRATCH","/tmp,/var/tmp","Per job /tmp and /var/tmp inside the job's scratch / /tmp y /var/tmp por tarea dentro de su directorio de trabajo")
+      else:
+        self.errores.append("err_scratch")
+
+    if(ret):
+      cfg_order.append("cfg_execute")
+      cfg_order.append("cfg_isolation")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
   # Habilitar restriccion de uso de recursos.
   def cfgSlots(self,valida):
     args=self.args
@@ -591,7 +1337,7 @@ class Install(object):
             args.ds=True
             ret=True
             slots+=1
-            config["cfg_rs"]=["""
+            config["cfg_rs"]=ConfigEntry(raw="""
             # Slots Configuration / Configuracion de Slots
             # Owner Slot / Slot para el propietario
             # Slot resources / Recursos del Slot
@@ -599,7 +1345,7 @@ class Install(object):
             # Create Slot / Crear Slot
             NUM_SLOTS_TYPE_%s = 1
             # Never run jobs in this slot / Nunca ejecutar tareas en este slot
-            SLOT_TYPE_%s_START=False""" % (slots,args.rs[0],args.rs[1],slots,slots)]
+            SLOT_TYPE_%s_START=False""" % (slots,args.rs[0],args.rs[1],slots,slots))
           else:
             args.rs=False
             self.errores.append("err_maxmem")
@@ -619,12 +1365,27 @@ class Install(object):
         else:
           strHold="$(MEMORY_EXCEEDED)"
           strReason="Job exceeded available memory. La tarea excedio la memoria disponible."
+        # Con cgroups el kernel limita la memoria, no se requieren expresiones.
+        if(args.cgroups):
+          memPolicy=""
+          holdReason=""
+        else:
+          memPolicy="""
+          # Check Memory used by the job / Verificar memoria usada por la tarea
+          MEMORY_EXCEEDED=((MemoryUsage*1.1 > Memory) =?= TRUE)
+          # If Memory Exceded, Evict job / Si se excede la memoria, cancelar la tarea
+          PREEMPT=($(PREEMPT)) || $(MEMORY_EXCEEDED)
+          WANT_SUSPEND=$(WANT_SUSPEND) && $(MEMORY_EXCEEDED)
+          WANT_HOLD=%s""" % strHold
+          holdReason="""
+          # Message to Job\'s owner / Mensaje para el propietario del Job.
+          WANT_HOLD_REASON=ifThenElse( $(WANT_HOLD),\"%s\",undefined )""" % strReason
         """
          Crear el slot con los recursos disponibles, es decir, si se
          solicitaron recursos para el usuario, usar solo lo que quedo,
          si no se solicito, usar todos los recursos.
         """
-        config["cfg_ds"]=["""
+        config["cfg_ds"]=ConfigEntry(raw="""
         # Dynamic Slot / Slot Dinamico
         # Use only available resources for the Slot / usar solo los recursos disponibles para el Slot
         SLOT_TYPE_%s = cpu=auto, ram=auto
@@ -636,20 +1397,12 @@ class Install(object):
         SLOT_TYPE_%s_START = True
         # Minimun Memory when job don't request any / Minimo de Memoria RAM cuando la tarea no solicita
         JOB_DEFAULT_REQUESTMEMORY=256
-        MODIFY_REQUEST_EXPR_REQUESTMEMORY=quantize(RequestMemory, {256})
-        # Check Memory used by the job / Verificar memoria usada por la tarea
-        MEMORY_EXCEEDED=((MemoryUsage*1.1 > Memory) =?= TRUE)
-        # If Memory Exceded, Evict job / Si se excede la memoria, cancelar la tarea
-        PREEMPT=($(PREEMPT)) || $(MEMORY_EXCEEDED)
-        WANT_SUSPEND=$(WANT_SUSPEND) && $(MEMORY_EXCEEDED)
-        WANT_HOLD=%s
+        MODIFY_REQUEST_EXPR_REQUESTMEMORY=quantize(RequestMemory, {256})%s
         # Reducir tiempo para borrar el slot de 10 a 2 minutos.
-        MaxVacateTime = 2 * $(MINUTE)
-        # Message to Job\'s owner / Mensaje para el propietario del Job.
-        WANT_HOLD_REASON=ifThenElse( $(WANT_HOLD),\"%s\",undefined )""" % (slots,slots,slots,slots,strHold,strReason)]
+        MaxVacateTime = 2 * $(MINUTE)%s""" % (slots,slots,slots,slots,memPolicy,holdReason))
 
       if(args.rs or args.ds):
-        config["cfg_slots"]=["NUM_SLOTS","%s" % slots,"Create required Slots / Crear Slots requeridos"]
+        config["cfg_slots"]=ConfigEntry("NUM_SLOTS","%s" % slots,"Create required Slots / Crear Slots requeridos")
         # Registrar cantidad de slots para futuras referencias
         self.args.slots=slots
 
@@ -662,6 +1415,40 @@ class Install(object):
       # Crear contenido
       self.config2Data(cfg_order,config)
 
+  # Politicas de consumo para que un slot particionable acepte varias
+  #  tareas en un mismo ciclo de negociacion.
+  def cfgConsumption(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    # Sin tipo de nodo no se sabe si configurar el Negotiator o el slot.
+    if(args.consumption and args.node not in ("m","ms","e")):
+      self.errores.append("err_cpnode")
+    elif(args.consumption and (args.node=="m" or args.node=="ms")):
+      ret=True
+      config["cfg_slotweights"]=ConfigEntry("NEGOTIATOR_USE_SLOT_WEIGHTS","True","Use SLOT_WEIGHT of partitionable slots / Usar SLOT_WEIGHT de los slots particionables")
+    elif(args.consumption and args.node=="e" and args.ds):
+      ret=True
+      # El slot dinamico es el ultimo creado por cfgSlots.
+      slot=args.slots
+      disk=args.ajs*1024 if args.ajs else 1024
+      config["cfg_consumption"]=ConfigEntry(raw="""
+        # Consumption policy, many jobs per negotiation cycle / Politica de consumo, varias tareas por ciclo de negociacion
+        SLOT_TYPE_%s_CONSUMPTION_POLICY = True
+        SLOT_TYPE_%s_CONSUMPTION_CPUS = quantize(target.RequestCpus, {1})
+        SLOT_TYPE_%s_CONSUMPTION_MEMORY = quantize(target.RequestMemory, {256})
+        SLOT_TYPE_%s_CONSUMPTION_DISK = quantize(target.RequestDisk, {%s})
+        SLOT_TYPE_%s_SLOT_WEIGHT = Cpus""" % (slot,slot,slot,slot,disk,slot))
+    elif(args.consumption and args.node=="e"):
+      self.errores.append("err_consumption")
+
+    if(ret):
+      cfg_order.append("cfg_slotweights")
+      cfg_order.append("cfg_consumption")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
   # Habilitar restriccion de uso de recursos.
   def cfgJobSize(self,valida):
     args=self.args
@@ -687,7 +1474,7 @@ class Install(object):
         """
          Crear ClassAds para limitar uso en disco de las tareas.
         """
-        config["cfg_ajs"]=["""
+        config["cfg_ajs"]=ConfigEntry(raw="""
         # Uncomment for Debug / Desomente para depuracion
         #STARTD_DEBUG = D_FULLDEBUG
         # Define maximum space to use for a Job.
@@ -703,17 +1490,17 @@ class Install(object):
         # Reducir tiempo para borrar el slot de 10 a 2 minutos.
         MaxVacateTime = 2 * $(MINUTE)
         # Message to Job's owner / Mensaje para el propietario del Job.
-        WANT_HOLD_REASON=ifThenElse( $(WANT_HOLD),\"%s\",undefined )""" % (args.ajs,args.ajs * 1024,args.ajs * 1024,strHold,strReason)]
+        WANT_HOLD_REASON=ifThenElse( $(WANT_HOLD),\"%s\",undefined )""" % (args.ajs,args.ajs * 1024,args.ajs * 1024,strHold,strReason))
         # Si se crearon slots antes
         # Se solicitaron recursos para el propietario.
         if(valida.findStrFile(args.task,args.config,"SLOT_TYPE_2_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_2_START = True")):
-          config["cfg_ajs_start"]=["SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.JobSize),TRUE, TARGET.JobSize < %s)" % ((args.ajs / 2) * 1024),"Maximum job size accepted / Tamaño maximo de tarea aceptado."]
+          config["cfg_ajs_start"]=ConfigEntry("SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.JobSize),TRUE, TARGET.JobSize < %s)" % ((args.ajs / 2) * 1024),"Maximum job size accepted / Tamaño maximo de tarea aceptado.")
         # No se solicito reservar recursos para el propietario.
         elif(valida.findStrFile(args.task,args.config,"SLOT_TYPE_1_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_1_START = True")):
-            config["cfg_ajs_start"]=["SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.JobSize),True, TARGET.JobSize < %s)" % ((args.ajs / 2) * 1024),"Maximum job size accepted / Tamaño maximo de tarea aceptado."]
+            config["cfg_ajs_start"]=ConfigEntry("SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.JobSize),True, TARGET.JobSize < %s)" % ((args.ajs / 2) * 1024),"Maximum job size accepted / Tamaño maximo de tarea aceptado.")
         # No se crearon slots antes
         else:
-          config["cfg_ajs_start"]=["START","$(START) && IfThenElse(isUndefined(TARGET.JobSize),TRUE, TARGET.JobSize < %s)" % ((args.ajs / 2) * 1024),"Maximum job size accepted / Tamaño maximo de tarea aceptado."]
+          config["cfg_ajs_start"]=ConfigEntry("START","$(START) && IfThenElse(isUndefined(TARGET.JobSize),TRUE, TARGET.JobSize < %s)" % ((args.ajs / 2) * 1024),"Maximum job size accepted / Tamaño maximo de tarea aceptado.")
     if(ret):
       cfg_order.append("cfg_ajs")
       cfg_order.append("cfg_ajs_start")
@@ -738,11 +1525,11 @@ class Install(object):
         """
         if(valida.findStrFile(args.task,args.config,"SLOT_TYPE_2_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_2_START = True")):
           # Ejecutar solo tareas del propietario.
-          config["cfg_usrprio"]=["SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.SubmitterUserPrio),True, TARGET.SubmitterUserPrio < %s.0)" % args.userprio,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos"]
+          config["cfg_usrprio"]=ConfigEntry("SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.SubmitterUserPrio),True, TARGET.SubmitterUserPrio < %s.0)" % args.userprio,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos")
         elif(valida.findStrFile(args.task,args.config,"SLOT_TYPE_1_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_1_START = True")):
-          config["cfg_usrprio"]=["SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.SubmitterUserPrio),True, TARGET.SubmitterUserPrio < %s.0)" % args.userprio,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos"]
+          config["cfg_usrprio"]=ConfigEntry("SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.SubmitterUserPrio),True, TARGET.SubmitterUserPrio < %s.0)" % args.userprio,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos")
         else:
-          config["cfg_usrprio"]=["STARTD_ATTRS","$(STARTD_ATTRS) && IfThenElse(isUndefined(TARGET.SubmitterUserPrio),True, TARGET.SubmitterUserPrio < %s.0)" % args.userprio,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos"]
+          config["cfg_usrprio"]=ConfigEntry("STARTD_ATTRS","$(STARTD_ATTRS) && IfThenElse(isUndefined(TARGET.SubmitterUserPrio),True, TARGET.SubmitterUserPrio < %s.0)" % args.userprio,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos")
       else:
         self.errores.append("err_wrongprio")
         ret=False
@@ -769,11 +1556,11 @@ class Install(object):
         """
         if(valida.findStrFile(args.task,args.config,"SLOT_TYPE_2_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_2_START = True")):
           # Ejecutar solo tareas del propietario.
-          config["cfg_usrslots"]=["SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.SubmitterUserResourcesInUse),True, TARGET.SubmitterUserResourcesInUse < %s)" % args.userslots,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos"]
+          config["cfg_usrslots"]=ConfigEntry("SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.SubmitterUserResourcesInUse),True, TARGET.SubmitterUserResourcesInUse < %s)" % args.userslots,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos")
         elif(valida.findStrFile(args.task,args.config,"SLOT_TYPE_1_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_1_START = True")):
-          config["cfg_usrslots"]=["SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.SubmitterUserResourcesInUse),True, TARGET.SubmitterUserResourcesInUse < %s)" % args.userslots,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos"]
+          config["cfg_usrslots"]=ConfigEntry("SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.SubmitterUserResourcesInUse),True, TARGET.SubmitterUserResourcesInUse < %s)" % args.userslots,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos")
         else:
-          config["cfg_usrslots"]=["STARTD_ATTRS","$(STARTD_ATTRS) && IfThenElse(isUndefined(TARGET.SubmitterUserResourcesInUse),True, TARGET.SubmitterUserResourcesInUse < %s)" % args.userslots,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos"]
+          config["cfg_usrslots"]=ConfigEntry("STARTD_ATTRS","$(STARTD_ATTRS) && IfThenElse(isUndefined(TARGET.SubmitterUserResourcesInUse),True, TARGET.SubmitterUserResourcesInUse < %s)" % args.userslots,"Restriction for users with high use of resources / Restriccion para usuarios con alto uso de recursos")
       else:
         self.errores.append("err_wrongslots")
         ret=False
@@ -800,11 +1587,11 @@ class Install(object):
         """
         if(valida.findStrFile(args.task,args.config,"SLOT_TYPE_2_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_2_START = True")):
           # Ejecutar solo tareas del propietario.
-          config["cfg_jobstart"]=["SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.NumJobStarts),True, TARGET.NumJobStarts < %s)" % args.jobstart,"Restriction for Jobs with multiple failures / Restriccion para Tareas con multiples fallos"]
+          config["cfg_jobstart"]=ConfigEntry("SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && IfThenElse(isUndefined(TARGET.NumJobStarts),True, TARGET.NumJobStarts < %s)" % args.jobstart,"Restriction for Jobs with multiple failures / Restriccion para Tareas con multiples fallos")
         elif(valida.findStrFile(args.task,args.config,"SLOT_TYPE_1_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_1_START = True")):
-          config["cfg_jobstart"]=["SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.NumJobStarts),True, TARGET.NumJobStarts < %s)" % args.jobstart,"Restriction for Jobs with multiple failures / Restriccion para Tareas con multiples fallos"]
+          config["cfg_jobstart"]=ConfigEntry("SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && IfThenElse(isUndefined(TARGET.NumJobStarts),True, TARGET.NumJobStarts < %s)" % args.jobstart,"Restriction for Jobs with multiple failures / Restriccion para Tareas con multiples fallos")
         else:
-          config["cfg_jobstart"]=["STARTD_ATTRS","$(STARTD_ATTRS) && IfThenElse(isUndefined(TARGET.NumJobStarts),True, TARGET.NumJobStarts < %s)" % args.jobstart,"Restriction for Jobs with multiple failures / Restriccion para Tareas con multiples fallos"]
+          config["cfg_jobstart"]=ConfigEntry("STARTD_ATTRS","$(STARTD_ATTRS) && IfThenElse(isUndefined(TARGET.NumJobStarts),True, TARGET.NumJobStarts < %s)" % args.jobstart,"Restriction for Jobs with multiple failures / Restriccion para Tareas con multiples fallos")
       else:
         self.errores.append("err_wrongstarts")
         ret=False
@@ -813,6 +1600,46 @@ class Install(object):
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
 
+  """
+   Perfil para tareas cortas: reutilizar los claims (y los shadows) para
+   varias tareas seguidas en lugar de negociar un slot por tarea, e
+   iniciar tareas en rafagas desde el Schedd.
+  """
+  def cfgShortJobs(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    if(args.shortjobs is not None):
+      if(args.shortjobs>0 and (args.task=="r" or args.node in ("e","s","ms"))):
+        ret=True
+        # En reconfiguracion sin -nt se crean ambos perfiles, cada demonio
+        #  ignora los knobs del otro.
+        if(args.node in ("e",None)):
+          config["cfg_sjclaim"]=ConfigEntry(raw="""
+            # Reuse claims for several jobs of the same user / Reutilizar claims para varias tareas del mismo usuario
+            CLAIM_WORKLIFE = %s
+            # Keep claims of busy schedds / Mantener claims de schedds ocupados
+            MAX_CLAIM_ALIVES_MISSED = 10""" % args.shortjobs)
+          # No cambiar el MaxVacateTime creado con -rs, -ds o -ajs.
+          if(not valida.findStrFile(args.task,args.config,"MaxVacateTime") and not valida.findStrConfig(self.configData,"MaxVacateTime")):
+            config["cfg_sjvacate"]=ConfigEntry("MaxVacateTime","2 * $(MINUTE)","Time to vacate a slot / Tiempo para desocupar un slot")
+        if(args.node!="e"):
+          # Nunca bajar SHADOW_WORKLIFE de su valor por defecto (3600).
+          config["cfg_sjstart"]=ConfigEntry(raw="""
+            # Start jobs in bursts / Iniciar tareas en rafagas
+            JOB_START_COUNT = 10
+            # Reuse shadows while the claim lives / Reutilizar shadows mientras el claim exista
+            SHADOW_WORKLIFE = %s""" % max(args.shortjobs,3600))
+      else:
+        self.errores.append("err_shortjobs")
+        ret=False
+
+    if(ret):
+      cfg_order+=["cfg_sjclaim","cfg_sjvacate","cfg_sjstart"]
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
   # Habilitar ejecucion de tareas de usuarios no existentes
   def cfgNoUser(self,valida):
     args=self.args
@@ -822,8 +1649,8 @@ class Install(object):
     # Se solicito habilitar SharedPort
     if(args.nu):
       ret=True
-      config["cfg_nu1"]=["SHADOW_RUN_UNKNOWN_USER_JOBS","True","Enable unexistent user jobs / Permitir tareas de usuarios no existentes"]
-      config["cfg_nu2"]=["SOFT_UID_DOMAIN","True"]
+      config["cfg_nu1"]=ConfigEntry("SHADOW_RUN_UNKNOWN_USER_JOBS","True","Enable unexistent user jobs / Permitir tareas de usuarios no existentes")
+      config["cfg_nu2"]=ConfigEntry("SOFT_UID_DOMAIN","True")
 
     if(ret and args.nu):
       cfg_order.append("cfg_nu1")
@@ -841,18 +1668,18 @@ class Install(object):
     if(args.owneruser):
       if(valida.checkUser(args.owneruser[0])):
         ret=True
-        config["cfg_owner1"]=["MachineOwner","\"%s\"" % args.owneruser[0],"CustomClassAd for Owner priority / ClassAd personal para prioridad del propietario"]
-        config["cfg_owner2"]=["STARTD_ATTRS","$(STARTD_ATTRS) MachineOwner"]
+        config["cfg_owner1"]=ConfigEntry("MachineOwner","\"%s\"" % args.owneruser[0],"CustomClassAd for Owner priority / ClassAd personal para prioridad del propietario")
+        config["cfg_owner2"]=ConfigEntry("STARTD_ATTRS","$(STARTD_ATTRS) MachineOwner")
         if(args.owneruser[1]=="S"):
-          config["cfg_owner3"]=["RANK","User =?= MY.MachineOwner","Uncommented priorize owner jobs but accept jobs from any user / Descomentado priorizar tareas del propietario, pero aceptar de todos los usuarios."]
+          config["cfg_owner3"]=ConfigEntry("RANK","User =?= MY.MachineOwner","Uncommented priorize owner jobs but accept jobs from any user / Descomentado priorizar tareas del propietario, pero aceptar de todos los usuarios.")
         else:
           if(valida.findStrFile(args.task,args.config,"SLOT_TYPE_2_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_2_START = True")):
             # Ejecutar solo tareas del propietario.
-            config["cfg_owner3"]=["SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && TARGET.User == MY.MachineOwner","Only jobs from Owner are acepted / Solo las tareas del propietario son aceptadas."]
+            config["cfg_owner3"]=ConfigEntry("SLOT_TYPE_2_START","$(SLOT_TYPE_2_START) && TARGET.User == MY.MachineOwner","Only jobs from Owner are acepted / Solo las tareas del propietario son aceptadas.")
           elif(valida.findStrFile(args.task,args.config,"SLOT_TYPE_1_START = True") or valida.findStrConfig(self.configData,"SLOT_TYPE_1_START = True")):
-            config["cfg_owner3"]=["SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && TARGET.User == MY.MachineOwner","Only jobs from Owner are acepted / Solo las tareas del propietario son aceptadas."]
+            config["cfg_owner3"]=ConfigEntry("SLOT_TYPE_1_START","$(SLOT_TYPE_1_START) && TARGET.User == MY.MachineOwner","Only jobs from Owner are acepted / Solo las tareas del propietario son aceptadas.")
           else:
-            config["cfg_owner3"]=["START","$(START) && TARGET.User == MY.MachineOwner","Only jobs from Owner are acepted / Solo las tareas del propietario son aceptadas."]
+            config["cfg_owner3"]=ConfigEntry("START","$(START) && TARGET.User == MY.MachineOwner","Only jobs from Owner are acepted / Solo las tareas del propietario son aceptadas.")
       else:
         self.errores.append("err_wrongowner")
         ret=False
@@ -862,6 +1689,33 @@ class Install(object):
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
 
+  """
+   Perfil de cache de sesiones de seguridad segun el tamano del pool: a
+   mas nodos, sesiones mas largas para evitar autenticaciones repetidas.
+   Nunca por debajo de los valores por defecto de HTCondor (86400s de
+   duracion, 3600s de lease). collector indica si el nodo ejecuta el Collector.
+  """
+  def sessionProfile(self,collector):
+    nodes=self.args.poolsize
+    # 1 dia (1 hora de lease) por cada 5000 nodos, hasta 7 dias.
+    days=min(7,max(1,-(-nodes//5000)))
+    block="""
+        # Security session cache for %s nodes / Cache de sesiones de seguridad para %s nodos""" % (nodes,nodes)
+    # Pools pequenos usan los valores por defecto.
+    if(days>1):
+      block+="""
+        SEC_DEFAULT_SESSION_DURATION = %s
+        SEC_DEFAULT_SESSION_LEASE = %s""" % (86400*days,3600*days)
+    block+="""
+        SEC_ENABLE_MATCH_PASSWORD_AUTHENTICATION = True
+        SEC_USE_FAMILY_SESSION = True
+        SEC_INVALIDATE_SESSIONS_VIA_TCP = True"""
+    if(collector):
+      # Una conexion TCP por demonio que se actualiza con el Collector.
+      block+="""
+        COLLECTOR_MAX_FILE_DESCRIPTORS = %s""" % max(1024,3*nodes+256)
+    return(block)
+
   # Habilitar clave para MasterSubmit
   def cfgPassMS(self,valida):
     args=self.args
@@ -871,7 +1725,7 @@ class Install(object):
     # Si el nodo es MasterSubmit y se solicito habilitar Clave
     if(args.passms):
       ret=True
-      config["cfg_passms"]=["""
+      config["cfg_passms"]=ConfigEntry(raw="""
         # Enable Password security for the Pool.
         # Habilitar seguridad por clave para el pool.
         SEC_DEFAULT_AUTHENTICATION = OPTIONAL
@@ -881,9 +1735,12 @@ class Install(object):
         SEC_PASSWORD_FILE = /etc/condor/poolpass
         SEC_DAEMON_INTEGRITY = REQUIRED
         SEC_CLIENT_AUTHENTICATION_METHODS = PASSWORD, FS, $(SEC_CLIENT_AUTHENTICATION_METHODS)
-       """]
+       """)
+      if(args.poolsize):
+        config["cfg_sessions"]=ConfigEntry(raw=self.sessionProfile(args.node in ("m","ms")))
     if(ret):
       cfg_order.append("cfg_passms")
+      cfg_order.append("cfg_sessions")
       # Crear contenido
       self.config2Data(cfg_order,config)
 
@@ -896,7 +1753,7 @@ class Install(object):
     # Si el nodo es de ejecucion y se solicito habilitar Clave
     if(args.passex):
       ret=True
-      config["cfg_passex"]=["""
+      config["cfg_passex"]=ConfigEntry(raw="""
         # Enable Password security for the Pool.
         # Habilitar seguridad por clave para el pool.
         SEC_PASSWORD_FILE = /etc/condor/poolpass
@@ -905,10 +1762,98 @@ class Install(object):
         SEC_DAEMON_AUTHENTICATION_METHODS = PASSWORD, FS, $(SEC_DAEMON_AUTHENTICATION_METHODS)
         SEC_CLIENT_AUTHENTICATION_METHODS = PASSWORD, FS, $(SEC_CLIENT_AUTHENTICATION_METHODS)
         ALLOW_DAEMON = condor_pool@*
-       """]
+       """)
+      if(args.poolsize):
+        config["cfg_sessions"]=ConfigEntry(raw=self.sessionProfile(False))
 
     if(ret):
       cfg_order.append("cfg_passex")
+      cfg_order.append("cfg_sessions")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
+  """
+   Lista de recursos compartidos de -cl (NOMBRE=N,... o archivo con una
+   linea NOMBRE=N por recurso). Retorna [(nombre, limite)], limite es None
+   si no se indico, o None si hay errores.
+  """
+  def parseLimits(self,valida):
+    if(not self.args.limits):
+      return []
+    if(os.path.isfile(self.args.limits)):
+      with open(self.args.limits,"r") as f:
+        items=[l.split("#")[0].strip() for l in f]
+    else:
+      items=self.args.limits.split(",")
+    ret=[]
+    for item in [i for i in items if i]:
+      lst=item.split("=")
+      if(not re.match(r"^[A-Za-z][A-Za-z0-9_]*$",lst[0].strip()) or len(lst)>2 or (len(lst)==2 and not valida.checkIntStr(lst[1].strip()))):
+        return None
+      ret.append((lst[0].strip(),int(lst[1]) if len(lst)==2 else None))
+    return(ret)
+
+  # Limites de concurrencia para proteger recursos compartidos.
+  def cfgConcurrency(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    if(args.limits):
+      limits=self.parseLimits(valida)
+      if(limits is None or (args.node in ("m","ms") and None in [l[1] for l in limits])):
+        self.errores.append("err_limits")
+      elif(args.node=="m" or args.node=="ms"):
+        ret=True
+        block=["# Concurrency limits for shared resources / Limites de concurrencia para recursos compartidos"]
+        for name,limit in limits:
+          block.append("%s_LIMIT = %s" % (name.upper(),limit))
+        config["cfg_limits"]=ConfigEntry(raw="\n%s" % "\n".join(block))
+
+    if(ret):
+      cfg_order.append("cfg_limits")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
+  # Enviar tareas a otros pools (flocking) cuando el pool esta lleno.
+  def cfgFlock(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    # Nodo de envio: pools destino ordenados por preferencia (host[:puerto][=prioridad]).
+    if(args.flockto and (args.node=="s" or args.node=="ms")):
+      targets=[]
+      items=args.flockto.split(",")
+      for idx,item in enumerate(items):
+        lst=item.strip().split("=")
+        host=lst[0].strip().split(":")
+        if(valida.checkFqdn(host[0]) and (len(host)==1 or (len(host)==2 and valida.checkIntStr(host[1]))) and \
+           (len(lst)==1 or (len(lst)==2 and valida.checkIntStr(lst[1].strip())))):
+          targets.append((int(lst[1]) if len(lst)>1 else idx,idx,lst[0].strip()))
+      if(len(targets)==len(items)):
+        ret=True
+        hosts=[t[2] for t in sorted(targets)]
+        config["cfg_flockto"]=ConfigEntry("FLOCK_TO",", ".join(hosts),"Pools to send jobs when this pool is full, in order / Pools a los que enviar tareas cuando este pool esta lleno, en orden")
+        # ALLOW_* no lleva puerto.
+        config["cfg_flockneg"]=ConfigEntry("ALLOW_NEGOTIATOR_SCHEDD","$(ALLOW_NEGOTIATOR_SCHEDD), %s" % ", ".join(valida.aggregateAllow([h.split(":")[0] for h in hosts])))
+      else:
+        self.errores.append("err_flock")
+    # Nodo maestro: schedds de otros pools que pueden enviar tareas.
+    if(args.flockfrom and (args.node=="m" or args.node=="ms")):
+      dominios=self.domains2Allow(valida,args.flockfrom)
+      if(dominios):
+        ret=True
+        config["cfg_flockfrom"]=ConfigEntry("FLOCK_FROM",", ".join(dominios),"Schedds allowed to flock to this pool / Schedds que pueden enviar tareas a este pool")
+        config["cfg_flockwrite"]=ConfigEntry("ALLOW_WRITE","$(ALLOW_WRITE), %s" % ",".join(valida.aggregateAllow(dominios)))
+      elif("err_flock" not in self.errores):
+        self.errores.append("err_flock")
+
+    if(ret):
+      cfg_order.append("cfg_flockto")
+      cfg_order.append("cfg_flockneg")
+      cfg_order.append("cfg_flockfrom")
+      cfg_order.append("cfg_flockwrite")
       # Crear contenido
       self.config2Data(cfg_order,config)
 
@@ -921,14 +1866,23 @@ class Install(object):
     # Si el nodo puede enviar y se solicito habilitar MPI
     if(args.mpis and (args.node=="ms" or args.node=="s")):
       ret=True
-      config["cfg_mpis1"]=["UNUSED_CLAIM_TIMEOUT","0","Allow MPI jobs to be sent/Permitir envio de tareas MPI."]
-      config["cfg_mpis2"]=["MPI_CONDOR_RSH_PATH","$(LIBEXEC)"]
-      config["cfg_mpis3"]=["ALTERNATE_STARTER_2","$(SBIN)/condor_starter"]
-      config["cfg_mpis4"]=["STARTER_2_IS_DC","True"]
-      config["cfg_mpis5"]=["SHADOW_MPI","$(SBIN)/condor_shadow"]
+      config["cfg_mpis1"]=ConfigEntry("UNUSED_CLAIM_TIMEOUT","0","Allow MPI jobs to be sent/Permitir envio de tareas MPI.")
+      config["cfg_mpis2"]=ConfigEntry("MPI_CONDOR_RSH_PATH","$(LIBEXEC)")
+      config["cfg_mpis3"]=ConfigEntry("ALTERNATE_STARTER_2","$(SBIN)/condor_starter")
+      config["cfg_mpis4"]=ConfigEntry("STARTER_2_IS_DC","True")
+      config["cfg_mpis5"]=ConfigEntry("SHADOW_MPI","$(SBIN)/condor_shadow")
+      # Mantener los rangos de cada tarea MPI en un mismo grupo (ParallelSchedulingGroup).
+      if(args.mpigroups):
+        config["cfg_mpis6"]=ConfigEntry(raw="""
+        # Keep parallel jobs inside one ParallelSchedulingGroup / Mantener tareas paralelas en un solo ParallelSchedulingGroup
+        JOB_TRANSFORM_NAMES = $(JOB_TRANSFORM_NAMES) ParallelGroups
+        JOB_TRANSFORM_ParallelGroups @=end
+        REQUIREMENTS JobUniverse == 11 && WantParallelSchedulingGroups =?= undefined
+        SET WantParallelSchedulingGroups True
+        @end""")
 
     if(ret):
-      for idx in range(1,6):
+      for idx in range(1,7):
         cfg_order.append("cfg_mpis%s" % idx)
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
@@ -942,23 +1896,32 @@ class Install(object):
     # Si el nodo es de ejecucion y se solicito habilitar MPI
     if(args.mpin and args.node=="e"):
       ret=True
-      config["cfg_mpin1"]=["DedicatedScheduler","\"DedicatedScheduler@%s\"" % args.master,"Allow MPI jobs to be run/Permitir ejecucion de tareas MPI."]
-      config["cfg_mpin2"]=["START","$(START) || True"]
-      config["cfg_mpin3"]=["STARTD_ATTRS","$(STARTD_ATTRS), DedicatedScheduler"]
-      config["cfg_mpin4"]=["STARTD_EXPRS","$(STARTD_EXPRS), DedicatedScheduler"]
-      config["cfg_mpin5"]=["SUSPEND","$(SUSPEND) || False"]
-      config["cfg_mpin6"]=["CONTINUE","$(CONTINUE) || True"]
-      config["cfg_mpin7"]=["PREEMPT","$(PREEMPT) || False"]
-      config["cfg_mpin8"]=["KILL","$(KILL) || False"]
-      config["cfg_mpin9"]=["WANT_SUSPEND","$(WANT_SUSPEND) || False"]
-      config["cfg_mpin10"]=["WANT_VACATE","$(WANT_VACATE) || False"]
-      config["cfg_mpin11"]=["RANK","$(RANK) && Scheduler =?= $(DedicatedScheduler)"]
-      config["cfg_mpin12"]=["MPI_CONDOR_RSH_PATH","$(LIBEXEC)"]
-      config["cfg_mpin13"]=["CONDOR_SSHD","/usr/sbin/sshd"]
-      config["cfg_mpin14"]=["CONDOR_SSH_KEYGEN","/usr/bin/ssh-keygen"]
+      config["cfg_mpin1"]=ConfigEntry("DedicatedScheduler","\"DedicatedScheduler@%s\"" % args.master,"Allow MPI jobs to be run/Permitir ejecucion de tareas MPI.")
+      config["cfg_mpin2"]=ConfigEntry("START","$(START) || True")
+      config["cfg_mpin3"]=ConfigEntry("STARTD_ATTRS","$(STARTD_ATTRS), DedicatedScheduler")
+      config["cfg_mpin4"]=ConfigEntry("STARTD_EXPRS","$(STARTD_EXPRS), DedicatedScheduler")
+      config["cfg_mpin5"]=ConfigEntry("SUSPEND","$(SUSPEND) || False")
+      config["cfg_mpin6"]=ConfigEntry("CONTINUE","$(CONTINUE) || True")
+      config["cfg_mpin7"]=ConfigEntry("PREEMPT","$(PREEMPT) || False")
+      config["cfg_mpin8"]=ConfigEntry("KILL","$(KILL) || False")
+      config["cfg_mpin9"]=ConfigEntry("WANT_SUSPEND","$(WANT_SUSPEND) || False")
+      config["cfg_mpin10"]=ConfigEntry("WANT_VACATE","$(WANT_VACATE) || False")
+      config["cfg_mpin11"]=ConfigEntry("RANK","$(RANK) && Scheduler =?= $(DedicatedScheduler)")
+      config["cfg_mpin12"]=ConfigEntry("MPI_CONDOR_RSH_PATH","$(LIBEXEC)")
+      config["cfg_mpin13"]=ConfigEntry("CONDOR_SSHD","/usr/sbin/sshd")
+      config["cfg_mpin14"]=ConfigEntry("CONDOR_SSH_KEYGEN","/usr/bin/ssh-keygen")
+      # Grupo de red (rack/switch) indicado o tomado del inventario.
+      group=args.pgroup or self.inventoryNode(valida).get("group")
+      if(args.pgroup or args.inventory):
+        if(group):
+          config["cfg_mpin15"]=ConfigEntry("ParallelSchedulingGroup","\"%s\"" % group,"Low latency network group / Grupo de red de baja latencia")
+          config["cfg_mpin16"]=ConfigEntry("STARTD_ATTRS","$(STARTD_ATTRS), ParallelSchedulingGroup")
+        else:
+          self.errores.append("err_nogroup")
+          ret=False
 
     if(ret):
-      for idx in range(1,15):
+      for idx in range(1,17):
         cfg_order.append("cfg_mpin%s" % idx)
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
@@ -972,10 +1935,43 @@ class Install(object):
     # Si el nodo es de ejecucion y se solicito habilitar MPI
     if(args.docker and args.node=="e"):
       ret=True
-      config["cfg_docker"]=["DOCKER","/usr/bin/docker", "Path to Docker"]
+      config["cfg_docker"]=ConfigEntry("DOCKER","/usr/bin/docker", "Path to Docker")
+      # Limite de imagenes en cache.
+      if(args.dockercache):
+        config["cfg_docker_cache"]=ConfigEntry("DOCKER_IMAGE_CACHE_SIZE","%s" % args.dockercache,"Docker images kept in cache / Imagenes Docker mantenidas en cache")
+      # Red por defecto de los contenedores.
+      if(args.dockernet):
+        config["cfg_docker_net"]=ConfigEntry("DOCKER_EXTRA_ARGUMENTS","$(DOCKER_EXTRA_ARGUMENTS) --network=%s" % args.dockernet,"Docker network mode / Modo de red de Docker")
+      # Volumen de trabajo en almacenamiento local rapido.
+      if(args.dockerscratch):
+        if(valida.checkPath(args.dockerscratch)):
+          config["cfg_docker_scratch"]=ConfigEntry(raw="""
+          # Scratch volume on local fast storage / Volumen de trabajo en almacenamiento local rapido
+          DOCKER_VOLUMES = $(DOCKER_VOLUMES) SCRATCH
+          DOCKER_VOLUME_DIR_SCRATCH = %s:/scratch
+          DOCKER_MOUNT_VOLUMES = $(DOCKER_MOUNT_VOLUMES) SCRATCH""" % args.dockerscratch)
+        else:
+          self.errores.append("err_dockerscratch")
+          ret=False
+      # Omitir prueba de Docker al iniciar el startd.
+      if(args.dockernotest):
+        config["cfg_docker_test"]=ConfigEntry("DOCKER_PERFORM_TEST","False","Skip Docker test on startup / Omitir prueba de Docker al iniciar")
+      # Pre-descargar imagenes con htdockerpull.sh como tarea cron.
+      if(args.dockerpull):
+        path=self.installScript("htdockerpull.sh")
+        if(path):
+          if(args.cronjob is None):
+            args.cronjob=[]
+          args.cronjob.append(["htdockerpull",path,"1h"," ".join(args.dockerpull.split(",")),"WaitForExit"])
+        else:
+          ret=False
 
     if(ret):
       cfg_order.append("cfg_docker")
+      cfg_order.append("cfg_docker_cache")
+      cfg_order.append("cfg_docker_net")
+      cfg_order.append("cfg_docker_scratch")
+      cfg_order.append("cfg_docker_test")
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
 
@@ -988,11 +1984,11 @@ class Install(object):
     # Si el nodo es de ejecucion y se solicito habilitar MPI
     if(args.rn and args.node=="e"):
       ret=True
-      config["cfg_remote"]=["""
+      config["cfg_remote"]=ConfigEntry(raw="""
        # This node is outside Pool's LAN
        IsRemote = True
        STARTD_ATTRS = $(STARTD_ATTRS) && (Target.MayUseAWS || Target.MayUseGCP || Target.MayUseIBM) IsRemote
-      """]
+      """)
     """
     startExpression = "START = MayUseAWS == TRUE\n";
     startExpression,
@@ -1003,35 +1999,123 @@ class Install(object):
       # Crear contenido inicial
       self.config2Data(cfg_order,config)
 
+  # Copiar script incluido con htconfig a /etc/condor si no esta instalado
+  #  o cambio, retorna la ruta instalada o None si no se pudo.
+  def installScript(self,name):
+    path="/etc/condor/%s" % name
+    bundled=os.path.join(os.path.dirname(os.path.abspath(__file__)),name)
+    # Al exportar o comparar (-diff) no se escribe en este equipo.
+    if(self.renderOnly or self.args.diff):
+      return path
+    try:
+      if(not os.path.isfile(path) or not filecmp.cmp(bundled,path,shallow=False)):
+        shutil.copyfile(bundled,path)
+        os.chmod(path,0o755)
+    except (IOError,OSError):
+      self.errores.append("err_nofile")
+      return None
+    return path
+
+  # Instalar sonda de rendimiento (htprobe.py) como tarea cron.
+  def cfgPerfProbe(self,valida):
+    args=self.args
+    # La sonda corre como STARTD_CRON, solo en nodos de ejecucion.
+    if(args.perfprobe and args.node!="e"):
+      self.errores.append("err_ppnode")
+    # Si el nodo es de ejecucion y se solicito la sonda
+    elif(args.perfprobe):
+      path=self.installScript("htprobe.py")
+      if(not path):
+        return
+      if(args.cronjob is None):
+        args.cronjob=[]
+      # Medir sobre el directorio de ejecucion de tareas.
+      args.cronjob.append(["htprobe",path,args.perfprobe,"-d $(EXECUTE)","WaitForExit"])
+
+  # Desfasar las actualizaciones de los demonios al Collector por nodo.
+  def cfgUpdateJitter(self,valida):
+    args=self.args
+    ret=False
+    cfg_order=[]
+    config={}
+    # Se solicito desfasar las actualizaciones.
+    if(args.updjitter):
+      ret=True
+      # Intervalo entre 270 y 329 segundos (por defecto 300) y desfase inicial
+      #  dentro del intervalo, ambos derivados del FQDN.
+      interval=270+self.hostHash("UPDATE_INTERVAL") % 60
+      config["cfg_updint"]=ConfigEntry("UPDATE_INTERVAL","%s" % interval,"Per node Collector update interval / Intervalo de actualizacion al Collector por nodo")
+      config["cfg_updoff"]=ConfigEntry("UPDATE_OFFSET","%s" % (self.hostHash("UPDATE_OFFSET") % interval),"Per node first update delay / Retraso de la primera actualizacion por nodo")
+
+    if(ret):
+      cfg_order.append("cfg_updint")
+      cfg_order.append("cfg_updoff")
+      # Crear contenido
+      self.config2Data(cfg_order,config)
+
   # Crear cronJobs.
   def cfgCronJob(self,valida):
     args=self.args
     ret=False
     cfg_order=[]
     config={}
-    # Se indico que hay NAT
-    if(args.cronjob):
-      # Validar que el script indicado existe.
-      if valida.checkPathFile(args.cronjob[1]):
-        ret=True
-        config["cfg_cronjob"]=["""
-        # User's Cronjob
-        STARTD_CRON_JOBLIST = $(STARTD_CRON_JOBLIST) %s
-        STARTD_CRON_%s_PREFIX = MY_
-        STARTD_CRON_%s_EXECUTABLE = %s
-        STARTD_CRON_%s_PERIOD = %s
-        STARTD_CRON_%s_MODE = periodic
-        STARTD_CRON_%s_RECONFIG = false
-        STARTD_CRON_%s_KILL = true
-        STARTD_CRON_%s_ARGS = %s""" % (args.cronjob[0],args.cronjob[0],args.cronjob[0],\
-       args.cronjob[1],args.cronjob[0],args.cronjob[2],\
-       args.cronjob[0],args.cronjob[0],args.cronjob[0],\
-       args.cronjob[0],args.cronjob[3])]
+    modes={"periodic":"Periodic","waitforexit":"WaitForExit","oneshot":"OneShot"}
+    jobs=list(args.cronjob or [])
+    # Leer tareas cron desde archivo, una por linea con los mismos campos de -cj.
+    if(args.cronfile):
+      if(os.path.isfile(args.cronfile) and os.path.getsize(args.cronfile)>0):
+        with open(args.cronfile,"r") as f:
+          for l in f:
+            if(l.strip() and not l.strip().startswith("#")):
+              try:
+                jobs.append(shlex.split(l))
+              except ValueError:  # Comillas sin cerrar.
+                self.errores.append("err_cronjob")
       else:
         self.errores.append("err_nofile")
-        ret=False
+    # Nombres repetidos: los knobs de la ultima tarea reemplazarian los de la primera.
+    names=[j[0] for j in jobs if j]
+    if(len(set(names))<len(names)):
+      self.errores.append("err_cronname")
+      jobs=[]
+    # Se indicaron tareas cron.
+    if(jobs):
+      ret=True
+      block=["# User's Cronjobs","STARTD_CRON_JOBLIST = $(STARTD_CRON_JOBLIST) %s" % " ".join([j[0] for j in jobs])]
+      for idx,job in enumerate(jobs):
+        # Validar campos, modo y que el script indicado existe.
+        if(len(job)<4 or len(job)>5 or (len(job)==5 and job[4].lower() not in modes)):
+          self.errores.append("err_cronjob")
+          ret=False
+          continue
+        # Al exportar, el script existe en el nodo destino y no aqui.
+        if not self.renderOnly and not valida.checkPathFile(job[1]):
+          self.errores.append("err_nofile")
+          ret=False
+          continue
+        name=job[0]
+        mode=modes[job[4].lower()] if len(job)==5 else "Periodic"
+        period=job[2]
+        secs=valida.period2Secs(period)
+        if(secs):
+          # Repartir las tareas dentro del 10% del periodo para que no
+          #  coincidan, con desfase adicional por nodo si se pidio -uj.
+          base=max(1,secs//10)
+          offset=(idx*base)//len(jobs)
+          if(args.updjitter):
+            offset+=self.hostHash("STARTD_CRON_%s" % name)
+          period="%s" % (secs+offset % base)
+        block.append("STARTD_CRON_%s_PREFIX = MY_" % name)
+        block.append("STARTD_CRON_%s_EXECUTABLE = %s" % (name,job[1]))
+        if(mode!="OneShot"):
+          block.append("STARTD_CRON_%s_PERIOD = %s" % (name,period))
+        block.append("STARTD_CRON_%s_MODE = %s" % (name,mode))
+        block.append("STARTD_CRON_%s_RECONFIG = false" % name)
+        block.append("STARTD_CRON_%s_KILL = true" % name)
+        block.append("STARTD_CRON_%s_ARGS = %s" % (name,job[3]))
+      config["cfg_cronjob"]=ConfigEntry(raw="\n%s" % "\n".join(block))
 
-    if(ret and args.cronjob):
+    if(ret):
       cfg_order.append("cfg_cronjob")
       # Crear contenido
       self.config2Data(cfg_order,config)
@@ -1047,7 +2131,7 @@ class Install(object):
       # Verificar que el script de apago existe.
       if valida.checkPathFile("/etc/condor/shutdown.sh"):
         ret=True
-        config["cfg_shutdown"]=["""
+        config["cfg_shutdown"]=ConfigEntry(raw="""
         # Tell HTCondor daemons to gracefully exit if the condor_startd observes
         # that it has had no active claims for more than 5 minutes and 30 seconds.
         STARTD_NOCLAIM_SHUTDOWN = 330
@@ -1060,7 +2144,7 @@ class Install(object):
         # the case that perhaps the condor_startd crashes.  It tells the
         # condor_master to exit if it notices for any reason that the
         # condor_startd is not running within 1 minute of startup.
-        MASTER.DAEMON_SHUTDOWN_FAST = ( STARTD_StartTime == 0 ) && ((time() - DaemonStartTime) > 60)"""]
+        MASTER.DAEMON_SHUTDOWN_FAST = ( STARTD_StartTime == 0 ) && ((time() - DaemonStartTime) > 60)""")
       else:
         self.errores.append("err_nofile")
         ret=False
@@ -1071,43 +2155,70 @@ class Install(object):
       # Crear contenido
       self.config2Data(cfg_order,config)
 
-  # Crear configuracion y almacenarla en el archivo respectivo.
-  def buildConfig(self):
-    valida=VerificaTipo()
-    # Si se indico master, extraer el dominio.
-    if(self.args.master and valida.checkFqdn(self.args.master)):
+  # Ejecutar las etapas cfg* que generan la configuracion.
+  def runStages(self,valida):
+    # Si se indico master por nombre (no IP), extraer el dominio.
+    if(self.args.master and valida.checkFqdn(self.args.master) and not valida.checkIpv4(self.args.master,True)):
       master_fqdn=self.args.master.split(".")[1:]
       self.args.masterdomain=".".join(master_fqdn)
     else:
       self.args.masterdomain=None
+    # Iniciar configuracion, registrando la etapa de cada entrada.
+    for stage in (self.cfgBegin,self.cfgAllow,self.cfgNat,self.cfgNoDns,self.cfgIp,
+                  self.cfgSharePort,self.cfgTcp,self.cfgLogBudget,self.cfgStatistics,self.cfgTransfer,self.cfgScratch,self.cfgCgroup,
+                  self.cfgSlots,self.cfgConsumption,self.cfgOwner,
+                  self.cfgJobSize,self.cfgUserPrio,self.cfgUserSlots,
+                  self.cfgJobStart,self.cfgShortJobs,self.cfgNoUser,self.cfgPassMS,
+                  self.cfgPassEX,self.cfgFlock,
+                  self.cfgConcurrency,self.cfgMpiSched,self.cfgMpiNode,
+                  self.cfgDocker,self.cfgRemoteNode,self.cfgPerfProbe,
+                  self.cfgUpdateJitter,
+                  self.cfgCronJob,self.cfgAutoShutdown):
+      self.stage=stage.__name__
+      stage(valida)
+    self.stage=None
+
+  """
+   Generar la configuracion sin validar, mostrar ni guardar el archivo y
+   sin instalar scripts en este equipo. Retorna el texto generado, o None
+   si hubo errores (quedan en self.errores).
+  """
+  def renderConfig(self):
+    self.renderOnly=True
+    self.runStages(VerificaTipo())
+    if(len(self.errores)>0):
+      return None
+    return self.configData
+
+  # Crear configuracion y almacenarla en el archivo respectivo.
+  def buildConfig(self):
+    valida=VerificaTipo()
     # Verificar archivo de configuracion.
     self.cfgConfigFile(valida)
-    # Iniciar configuracion.
-    self.cfgBegin(valida)
-    self.cfgAllow(valida)
-    self.cfgNat(valida)
-    self.cfgIp(valida)
-    self.cfgSharePort(valida)
-    self.cfgTcp(valida)
-    self.cfgSlots(valida)
-    self.cfgOwner(valida)
-    self.cfgJobSize(valida)
-    self.cfgUserPrio(valida)
-    self.cfgUserSlots(valida)
-    self.cfgJobStart(valida)
-    self.cfgNoUser(valida)
-    self.cfgPassMS(valida)
-    self.cfgPassEX(valida)
-    self.cfgMpiSched(valida)
-    self.cfgMpiNode(valida)
-    self.cfgDocker(valida)
-    self.cfgRemoteNode(valida)
-    self.cfgCronJob(valida)
-    self.cfgAutoShutdown(valida)
+    self.runStages(valida)
 
     if(not self.checkErrors()):
      return False
-    print(self.configData)
+    # Solo comparar con la configuracion actual, sin guardar.
+    if(self.args.diff):
+      self.diffConfig(valida)
+      return True
+    # Crear directorios solo cuando todas las etapas validaron.
+    for path in self.dirs:
+      try:
+        if(not os.path.isdir(path)):
+          os.makedirs(path,0o755)
+      except OSError:
+        self.errores.append("err_scratch")
+    if(not self.checkErrors()):
+     return False
+    # Mostrar configuracion en el formato solicitado.
+    if(self.args.outformat=="json"):
+      print(self.model2Json())
+    elif(self.args.outformat=="classad"):
+      print(self.model2ClassAd())
+    else:
+      print(self.configData)
     # guardar datos
     if(self.args.task=="c"):
      with open(self.args.config, "wt") as configFile:
@@ -1134,8 +2245,14 @@ Output     = HostOut.$(Cluster)_$(Process).txt
 Error      = HostErr.$(Cluster)_$(Process).txt
 # restart jobs that are in Hold state and have run less than 10 times.
 #Periodic_Release = ((JobStatus==5) && JobRunCount <= 10)
-Queue 5
+%sQueue 5
 """
+      # Limites de concurrencia declarados con -cl.
+      limits=self.parseLimits(valida)
+      if(limits):
+        exampleSubmit=exampleSubmit % ("# Shared resources used by the job / Recursos compartidos usados por la tarea\nconcurrency_limits = %s\n" % ",".join([l[0] for l in limits]))
+      else:
+        exampleSubmit=exampleSubmit % ""
       with open("checkCondor.condor", "wt") as exFile:
         exFile.write(exampleSubmit)
       exampleSubmit="""
@@ -1176,15 +2293,22 @@ grp2=parser.add_argument_group('Common/Comunes')
 grp2.add_argument('-cf', '--config-file', action="store", dest="config", help="Path to condor_config.local/Ruta a condor_config.local")
 grp2.add_argument('-nt', '--node-type', action="store", dest="node", choices=['m', 's', 'e', 'ms'], help="Node type/Tipo de nodo: m=Master, s=Submit, e=Execute, ms=Master Submit")
 grp2.add_argument('-ns', '--no-swap', action="store_true", dest="swap", default=False, help="Don't use swap/No usar Swap.")
+grp2.add_argument('-of', '--output-format', action="store", dest="outformat", choices=['text', 'json', 'classad'], default="text", help="Format of the configuration shown on screen/Formato de la configuracion mostrada en pantalla: text=Config file/Archivo de configuracion, json, classad")
+grp2.add_argument('-diff', '--diff', action="store_true", dest="diff", default=False, help="Don't save, compare with current config file and show if condor_reconfig or condor_restart is needed/No guardar, comparar con el archivo de configuracion actual y mostrar si se requiere condor_reconfig o condor_restart.")
+grp2.add_argument('-inv', '--inventory', action="store", dest="inventory", help="Inventory file, one 'fqdn type [key=value ...]' per line (keys: group, ip)/Archivo de inventario, una linea 'fqdn tipo [llave=valor ...]' por nodo (llaves: group, ip).")
 grp2.add_argument('-cm', '--condor-master', action="store", dest="master", help="Central Manager (FQDN).")
 
 grp3=parser.add_argument_group('Network parameters/Parametros de red')
 grp3.add_argument('-nd', '--network-domain', action="store", dest="domain", help="Network's domain/Dominio de red.")
 grp3.add_argument('-ed', '--extra-domains', action="store", dest="domains", help="Domains allowed to sent jobs (Ex: *.domain1,*.domain2,192.168.*)/Dominios autorizados para enviar tareas (Ej: *.domain1,*.domain2,192.168.*).")
+grp3.add_argument('-ft', '--flock-to', action="store", dest="flockto", help="Submit: Central Managers of pools to flock to (host[:port]), with optional preference (lower first), default list order. Ex -ft cm1.other.org=2,cm2.far.org:9619=1 / Envio: Central Managers de pools a los que enviar tareas (host[:puerto]), con preferencia opcional (menor primero), por defecto el orden de la lista. Ej. -ft cm1.other.org=2,cm2.far.org:9619=1")
+grp3.add_argument('-ff', '--flock-from', action="store", dest="flockfrom", help="Master: domains/IPs of schedds allowed to flock to this pool. Ex -ff other.org,10.1.2.3 / Maestro: dominios/IPs de schedds que pueden enviar tareas a este pool. Ej. -ff other.org,10.1.2.3")
 grp3.add_argument('-nat', '--nat-ips', action="store", dest="nodeips", nargs=2, help="Public and NAT IPs of the node. Ex -nat 8.8.1.4 192.168.1.2/IP publico y en NAT del nodo. Ej. -nat 8.8.1.4 192.168.1.2")
+grp3.add_argument('-nodns', '--no-dns', action="store_true", dest="nodns", default=False, help="NAT (-nat) or remote (-rn) nodes: don't use DNS, Central Manager and ALLOW rules by IP (from -inv 'ip=')/Nodos en NAT (-nat) o remotos (-rn): no usar DNS, Central Manager y reglas ALLOW por IP (desde 'ip=' en -inv).")
 grp3.add_argument('-ip', '--ip-address', action="store", dest="ip", help="IP to use/IP a usar.")
 grp3.add_argument('-usp', '--use-shared-port', action="store_true", dest="usesp", default=False, help="Make all process uses same port than Collector (9618)/Hacer que  todos los procesos usen el mismo puerto que el Collector (9618).")
 grp3.add_argument('-sp', '--shared-port', action="store", dest="sport", type=int, help="Make all process except Collector to use only port SPORT/Hacer que todos los procesos excepto Collector usen el puerto SPORT.")
+grp3.add_argument('-ftp', '--file-transfer-profile', action="store", dest="ftprofile", type=int, nargs="?", const=0, help="Submit nodes: tune file transfer queue to NIC speed (Mb/s, detected if omitted) and spool disk/Nodos de envio: ajustar cola de transferencia a la velocidad de red (Mb/s, detectada si se omite) y al disco del spool.")
 grp3.add_argument('-tcp', '--use-tcp', action="store_true", dest="usetcp", default=False, help="Use TCP for Collector connections/Usar TCP para conexiones con el Collector.")
 
 grp4=parser.add_argument_group('User and resources\'s parameters/Parametros de Usuario y recursos')
@@ -1192,34 +2316,59 @@ grp4.add_argument('-nu', '--nobody-user', action="store_true", dest="nu", defaul
 grp4.add_argument('-ou', '--owner-user', action="store", dest="owneruser", nargs=2, help="Full username of the node\'s owner and type of use ([P] private or [S] shared). Ex -ou johndoe@cloud.test.org S / Nombre de usuario completo del propietario del nodo y tipo de uso ([P] privado o [S] compartido). Ej. -ou johndoe@cloud.test.org S")
 grp4.add_argument('-rs', '--reserved-slot', action="store", dest="rs", type=int, nargs=2, help="CPU and RAM for the user's reserved slot. Ex -rs 1 10 for 1 core and 10%% RAM/Cores y RAM para el slot dedicado al usuario. Ej. -rs 1 10 para 1 core y 10%% de RAM")
 grp4.add_argument('-ds', '--dynamic-slot', action="store_true", dest="ds", default=False, help="Create an uniq and dynamic slot with all resources/Crear un slot unico y dinamico con todos los recursos.")
+grp4.add_argument('-cg', '--cgroups', action="store_true", dest="cgroups", default=False, help="Enforce job memory with cgroups instead of MEMORY_EXCEEDED expressions/Limitar memoria de las tareas con cgroups en lugar de expresiones MEMORY_EXCEEDED.")
+grp4.add_argument('-fs', '--fast-scratch', action="store", dest="fastscratch", type=int, nargs="?", const=10, help="Put EXECUTE on the fastest local storage (NVMe, SSD, HDD) with at least FASTSCRATCH GB free and size -ajs from it/Ubicar EXECUTE en el almacenamiento local mas rapido (NVMe, SSD, HDD) con al menos FASTSCRATCH GB libres y calcular -ajs segun este.")
+grp4.add_argument('-fst', '--fast-scratch-tmpfs', action="store_true", dest="fstmpfs", default=False, help="Allow -fs to choose tmpfs (uses RAM)/Permitir que -fs elija tmpfs (usa RAM).")
+grp4.add_argument('-fsi', '--fast-scratch-isolation', action="store_true", dest="fsisolation", default=False, help="Per job /tmp and /var/tmp inside the job's scratch (MOUNT_UNDER_SCRATCH)/ /tmp y /var/tmp por tarea dentro de su directorio de trabajo (MOUNT_UNDER_SCRATCH).")
 #grp4.add_argument('-pn', '--private-node', action="store_true", default=False, dest="privnode", help="Define this node as private, it means, only 'owner user' job's are accepted./Define este nodo como privado, es decir, solo las tareas del \'propietario\' son ejecutadas.")
+grp4.add_argument('-cp', '--consumption-policy', action="store_true", dest="consumption", default=False, help="Execute: consumption policy and SLOT_WEIGHT for the dynamic slot, Master: NEGOTIATOR_USE_SLOT_WEIGHTS. Fills big nodes in one negotiation cycle/Ejecucion: politica de consumo y SLOT_WEIGHT para el slot dinamico, Maestro: NEGOTIATOR_USE_SLOT_WEIGHTS. Llena nodos grandes en un ciclo de negociacion.")
+grp4.add_argument('-cl', '--concurrency-limits', action="store", dest="limits", help="Shared resources as NAME=N,... or file with one NAME=N per line. Master: NAME_LIMIT = N, Submit: concurrency_limits in example submit file. Ex -cl nfs=50,matlab=10 / Recursos compartidos como NOMBRE=N,... o archivo con una linea NOMBRE=N. Maestro: NOMBRE_LIMIT = N, Envio: concurrency_limits en el archivo de envio de ejemplo. Ej. -cl nfs=50,matlab=10")
 grp4.add_argument('-ajs', '--accepted-jobsize', action="store", dest="ajs", type=int, help="Maximum Job running size allowed, the maximum accepted JobSize is half this value. Ex -ajs 100 accept jobs until 50MB and hold jobs than exceeds 100MB in disk/Máximo tamaño en disco permitido. Ej. -ajs 100 acepta tareas de hasta 50MB y detiene tareas que ocupen mas de 100MB en disco.")
 grp4.add_argument('-aup', '--accepted-user-priority', action="store", dest="userprio", type=int, help="Maximun User priority allowed to run jobs in the node (must be greater than 600). Ex -aup 1000 / Prioridad de usuario máxima permitida para ejecutar tareas en el nodo (debe ser mayor a 600). Ej. -aup 1000.")
 grp4.add_argument('-mus', '--maximun-user-slots', action="store", dest="userslots", type=int, help="Maximun Slots allowed to use for a user (must be greater than 0). Ex -mus 100 / Maximo de Slots permitidos para un usuario (debe ser mayor a 0). Ej. -mus 1.")
+grp4.add_argument('-sj', '--short-jobs', action="store", dest="shortjobs", type=int, nargs="?", const=7200, help="Short jobs profile, reuse claims for SHORTJOBS seconds (HTCondor default 1200): CLAIM_WORKLIFE on execute nodes, SHADOW_WORKLIFE (at least 3600) and job start bursts on submit nodes/Perfil de tareas cortas, reutilizar claims por SHORTJOBS segundos (1200 por defecto en HTCondor): CLAIM_WORKLIFE en nodos de ejecucion, SHADOW_WORKLIFE (minimo 3600) e inicio de tareas en rafagas en nodos de envio.")
 grp4.add_argument('-mjs', '--maximun-job-starts', action="store", dest="jobstart", type=int, help="Maximun limit of job restarts accepted (must be greater than 1). Ex -mjs 2 / Limite maximo de reinicios de tareas acceptado (debe ser mayor a 1). Ej. -mjs 2")
 
 grp5=parser.add_argument_group('Security parameters/Parametros de Seguridad')
 grp5.add_argument('-passms', '--password-ms', action="store_true", default=False, dest="passms", help="Enable password for MasterSubmit node, save password in /etc/condor/poolpass./Habilitar clave para nodo MasterEnvio, guardar clave en /etc/condor/poolpass.")
+grp5.add_argument('-ps', '--pool-size', action="store", dest="poolsize", type=int, help="With -passms/-passex: size security session caching for a pool of POOLSIZE nodes/Con -passms/-passex: ajustar cache de sesiones de seguridad para un pool de POOLSIZE nodos.")
 grp5.add_argument('-passex', '--password-ex', action="store_true", default=False, dest="passex", help="Enable password for Excecute node, save password in /etc/condor/poolpass./Habilitar clave para nodo de Ejecucion, guardar clave en /etc/condor/poolpass.")
 
 grp6=parser.add_argument_group('Extra parameters/Parametros extra')
 grp6.add_argument('-mpis', '--mpi-sched', action="store_true", default=False, dest="mpis", help="Allow MPI jobs to be sent/Permitir envio de tareas MPI.")
 grp6.add_argument('-mpin', '--mpi-node', action="store_true", default=False, dest="mpin", help="Allow MPI jobs to be run/Permitir ejecucion de tareas MPI.")
+grp6.add_argument('-pg', '--parallel-group', action="store", dest="pgroup", help="Rack/switch label for MPI nodes (ParallelSchedulingGroup), default: 'group' from -inv/Etiqueta de rack/switch para nodos MPI (ParallelSchedulingGroup), por defecto: 'group' de -inv.")
+grp6.add_argument('-mpig', '--mpi-groups', action="store_true", default=False, dest="mpigroups", help="With -mpis: run each parallel job inside one ParallelSchedulingGroup/Con -mpis: ejecutar cada tarea paralela dentro de un solo ParallelSchedulingGroup.")
 grp6.add_argument('-docker', '--docker', action="store_true", default=False, dest="docker", help="Allow Docker universe tasks/Permitir tareas universo Docker.")
+grp6.add_argument('-dic', '--docker-image-cache', action="store", dest="dockercache", type=int, help="Docker images kept in cache (DOCKER_IMAGE_CACHE_SIZE)/Imagenes Docker mantenidas en cache (DOCKER_IMAGE_CACHE_SIZE).")
+grp6.add_argument('-dnet', '--docker-network', action="store", dest="dockernet", choices=['bridge', 'host', 'none'], help="Docker network mode for jobs/Modo de red Docker para las tareas.")
+grp6.add_argument('-dsv', '--docker-scratch', action="store", dest="dockerscratch", help="Local fast storage path mounted as /scratch in containers. Ex -dsv /nvme/scratch / Ruta en almacenamiento local rapido montada como /scratch en los contenedores. Ej. -dsv /nvme/scratch")
+grp6.add_argument('-dnt', '--docker-no-test', action="store_true", default=False, dest="dockernotest", help="Skip Docker test on startup (DOCKER_PERFORM_TEST = False)/Omitir prueba de Docker al iniciar (DOCKER_PERFORM_TEST = False).")
+grp6.add_argument('-dpi', '--docker-pull', action="store", dest="dockerpull", help="Images to pre-pull hourly with htdockerpull.sh. Ex -dpi centos:7,python:3 / Imagenes a pre-descargar cada hora con htdockerpull.sh. Ej. -dpi centos:7,python:3")
 grp6.add_argument('-rn', '--remote-node', action="store_true", default=False, dest="rn", help="Define this node as Remote (not in the same LAN)/Define este nodo como Remoto (No en la misma LAN).")
-grp6.add_argument('-cj', '--cron-job', action="store", dest="cronjob", nargs=4, help="Name, Script's pathname, periodicity and arguments for STARTD_CRON. Ex -cj mycron /etc/condor/cron.bash 15m \"myarg1=1 myarg2=2\" / Nombre, pathname del script, periodicidad y argumentos para STARD_CRON. Ej. -cj mycron /etc/condor/cron.bash 15m \"myarg1=1 myarg2=2\"")
+grp6.add_argument('-cj', '--cron-job', action="append", dest="cronjob", nargs="+", help="Name, Script's pathname, periodicity, arguments and optional mode (Periodic, WaitForExit, OneShot) for STARTD_CRON, can be repeated. Ex -cj mycron /etc/condor/cron.bash 15m \"myarg1=1 myarg2=2\" WaitForExit / Nombre, pathname del script, periodicidad, argumentos y modo opcional (Periodic, WaitForExit, OneShot) para STARD_CRON, puede repetirse. Ej. -cj mycron /etc/condor/cron.bash 15m \"myarg1=1 myarg2=2\" WaitForExit")
+grp6.add_argument('-cjf', '--cron-job-file', action="store", dest="cronfile", help="File with one cron job per line, same fields than -cj/Archivo con una tarea cron por linea, mismos campos que -cj.")
+grp6.add_argument('-pp', '--perf-probe', action="store", dest="perfprobe", nargs="?", const="1h", help="Install htprobe.py as STARTD_CRON to publish MY_PerfScore (CPU, disk and memory speed) every PERFPROBE (default 1h)/Instalar htprobe.py como STARTD_CRON para publicar MY_PerfScore (velocidad de CPU, disco y memoria) cada PERFPROBE (1h por defecto).")
+grp6.add_argument('-pr', '--perf-rank', action="store_true", default=False, dest="perfrank", help="Master: prefer nodes with higher MY_PerfScore/Maestro: preferir nodos con mayor MY_PerfScore.")
+grp6.add_argument('-lb', '--log-budget', action="store", dest="logbudget", type=int, help="Disk budget in MB for this node's daemon logs, split by daemon with rotation/Presupuesto de disco en MB para los logs de los demonios del nodo, repartido por demonio con rotacion.")
+grp6.add_argument('-stats', '--statistics', action="store", dest="stats", choices=['basic', 'detail'], help="Publish daemon statistics for this node type (Collector/Negotiator, Schedd/transfers)/Publicar estadisticas de los demonios de este tipo de nodo (Collector/Negotiator, Schedd/transferencias).")
+grp6.add_argument('-mx', '--metrics-exporter', action="store", dest="metrics", type=int, nargs="?", const=9118, help="With -stats: run htexporter.py under condor_master, Prometheus metrics on port METRICS/Con -stats: ejecutar htexporter.py bajo condor_master, metricas Prometheus en el puerto METRICS.")
+grp6.add_argument('-lbt', '--log-tmpfs', action="store", dest="logtmpfs", nargs="?", const="/dev/shm", help="With -lb: put chatty logs (Negotiator, Shadow, Starter) in tmpfs directory/Con -lb: ubicar logs ruidosos (Negotiator, Shadow, Starter) en directorio tmpfs.")
+grp6.add_argument('-uj', '--update-jitter', action="store_true", default=False, dest="updjitter", help="Per node UPDATE_INTERVAL/UPDATE_OFFSET and cron periods derived from the FQDN, avoids update bursts to the Collector./UPDATE_INTERVAL/UPDATE_OFFSET y periodos de cron por nodo derivados del FQDN, evita rafagas de actualizaciones al Collector.")
 grp6.add_argument('-as', '--auto-shutdown', action="store_true", default=False, dest="shutdown", help="Enable automatic shutdown if node iddle for more than 15 minutes. / Habilitar apagado automatico si el nodo esta libre por mas de 15 minutos.")
 
-result=parser.parse_args()
-# print(result)
+if __name__ == "__main__":
+  result=parser.parse_args()
+  # print(result)
 
-if(not result.config):
-  print("-cf: Invalid or missing config file / Archivo de configuracion incorrecto o faltante")
-  exit(1)
+  if(not result.config):
+    print("-cf: Invalid or missing config file / Archivo de configuracion incorrecto o faltante")
+    exit(1)
 
-# Se configurara una instalacion
-print("Iniciando procesamiento / Starting processing")
-ins=Install(result,"htconfig_v2.py")
-ins.buildConfig()
+  # Se configurara una instalacion
+  if(result.outformat=="text"):
+    print("Iniciando procesamiento / Starting processing")
+  ins=Install(result,"htconfig_v2.py")
+  ins.buildConfig()
 
 # python htconfig.py c -cf ./condor_config.local -cm condor-headnode.univalle.edu.co -nd univalle.edu.co -ed *.eisc.univalle.edu.co,172.18.1.* -sp 9619 -nat 192.168.131.2 172.18.1.249 -nt e -ip 172.18.1.249 -mpin
@@ -0,0 +1,206 @@
+# This Python file uses the following encoding: utf-8
+"""
+ Script para distribuir archivos de configuracion de HTCondor generados
+ por htconfig.py hacia los nodos del pool.
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Rutas y directorios
+import os
+# Copia de archivos (transporte local)
+import shutil
+# Ejecucion de ssh/rsync
+import subprocess
+# Bloqueo para el reporte de progreso
+import threading
+# Tiempos y esperas
+import time
+# Concurrencia limitada
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+"""
+  Transporte a directorio local, util para pruebas. Cada host es un
+  subdirectorio de root y dst se crea dentro de el. Un transporte sabe
+  abrir una conexion hacia un host (open), enviar un archivo (push) y
+  cerrar la conexion (close).
+"""
+class DirTransport(object):
+  def __init__(self,root):
+    self.root=root
+
+  # No requiere conexion.
+  def open(self,host):
+    pass
+
+  def push(self,host,src,dst):
+    target=os.path.join(self.root,host,dst.lstrip("/"))
+    tdir=os.path.dirname(target)
+    if not os.path.isdir(tdir):
+      os.makedirs(tdir)
+    # Copiar a temporal y renombrar, para que el cambio sea atomico.
+    tmp="%s.htdeploy" % target
+    shutil.copyfile(src,tmp)
+    os.rename(tmp,target)
+
+  def close(self,host):
+    pass
+
+"""
+  Transporte por ssh/rsync. Se abre una conexion maestra de ssh por host
+  (ControlMaster) que es reutilizada por todos los rsync hacia ese host.
+"""
+class SshTransport(object):
+  def __init__(self,user="root",sockDir="/tmp",persist=600,timeout=10):
+    self.user=user
+    self.sockDir=sockDir
+    self.persist=persist
+    self.timeout=timeout
+
+  # Opciones comunes de ssh para reutilizar la conexion.
+  def sshOpts(self,host):
+    return ["-o","ControlMaster=auto",
+            "-o","ControlPath=%s/htdeploy-%%r@%%h:%%p" % self.sockDir,
+            "-o","ControlPersist=%s" % self.persist,
+            "-o","ConnectTimeout=%s" % self.timeout,
+            "-o","BatchMode=yes"]
+
+  def target(self,host):
+    if self.user:
+      return "%s@%s" % (self.user,host)
+    return host
+
+  def open(self,host):
+    # Crear conexion maestra en segundo plano.
+    subprocess.check_call(["ssh","-MNf"]+self.sshOpts(host)+[self.target(host)])
+
+  def push(self,host,src,dst):
+    rsh="ssh %s" % " ".join(self.sshOpts(host))
+    subprocess.check_call(["rsync","-a","--checksum","-e",rsh,src,"%s:%s" % (self.target(host),dst)])
+
+  def close(self,host):
+    subprocess.call(["ssh","-O","exit"]+self.sshOpts(host)+[self.target(host)],
+                    stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
+
+"""
+  Clase encargada de enviar las configuraciones a cada host usando un
+  transporte, con concurrencia limitada y reintentos.
+"""
+class Deploy(object):
+  def __init__(self,transport,workers=16,retries=3,backoff=1.0):
+    self.transport=transport
+    self.workers=workers
+    self.retries=retries
+    self.backoff=backoff
+    # Progreso del despliegue.
+    self.done=0
+    self.total=0
+    self.lock=threading.Lock()
+    # Resultados por host: (ok, intentos de conexion, intentos de envio, segundos, error)
+    self.results={}
+
+  """
+    Leer archivos a desplegar desde srcDir. Se espera un subdirectorio por
+    host (FQDN) con los archivos a copiar en dstDir, ej:
+     srcDir/nodo1.dominio.org/condor_config.local
+  """
+  def collect(self,srcDir,dstDir):
+    jobs={}
+    for host in sorted(os.listdir(srcDir)):
+      hostDir=os.path.join(srcDir,host)
+      if not os.path.isdir(hostDir):
+        continue
+      files=[]
+      for base,dirs,names in os.walk(hostDir):
+        for name in sorted(names):
+          src=os.path.join(base,name)
+          rel=os.path.relpath(src,hostDir)
+          files.append((src,os.path.join(dstDir,rel)))
+      if files:
+        jobs[host]=files
+    return jobs
+
+  # Ejecutar fn con reintentos y espera exponencial entre ellos,
+  #  tries[0] acumula los intentos realizados de esa operacion.
+  def retry(self,tries,fn,*fargs):
+    n=0
+    while True:
+      n+=1
+      tries[0]+=1
+      try:
+        return fn(*fargs)
+      except Exception:
+        if n>self.retries:
+          raise
+        time.sleep(self.backoff*(2**(n-1)))
+
+  # Enviar todos los archivos de un host sobre la misma conexion.
+  def pushHost(self,host,files):
+    start=time.time()
+    # Conexiones y envios se cuentan por separado.
+    conns=[0]
+    pushes=[0]
+    try:
+      self.retry(conns,self.transport.open,host)
+      for src,dst in files:
+        self.retry(pushes,self.transport.push,host,src,dst)
+      ret=(True,conns[0],pushes[0],time.time()-start,None)
+    except Exception as e:
+      ret=(False,conns[0],pushes[0],time.time()-start,str(e))
+    finally:
+      self.transport.close(host)
+    return ret
+
+  # Mostrar progreso de un host terminado.
+  def report(self,host,res):
+    with self.lock:
+      self.done+=1
+      state="OK" if res[0] else "FAIL"
+      print("[%s/%s] %s %s (%.2fs, connect/conexion: %s, push/envio: %s)%s" % (self.done,self.total,state,host,res[3],res[1],res[2],
+            "" if res[0] else " %s" % res[4]))
+
+  # Desplegar jobs {host: [(src,dst),...]}, retorna True si todo fue enviado.
+  def run(self,jobs):
+    self.total=len(jobs)
+    start=time.time()
+    with ThreadPoolExecutor(max_workers=self.workers) as pool:
+      futures=dict((pool.submit(self.pushHost,host,files),host) for host,files in jobs.items())
+      for fut in as_completed(futures):
+        host=futures[fut]
+        self.results[host]=fut.result()
+        self.report(host,self.results[host])
+    failed=[h for h in self.results if not self.results[h][0]]
+    print("----- Deploy/Despliegue: %s hosts, %s OK, %s FAIL, %.2fs -----" % (self.total,self.total-len(failed),len(failed),time.time()-start))
+    for host in sorted(failed):
+      print("Error [%s]: %s" % (host,self.results[host][4]))
+    return len(failed)==0
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Config Deployer <=',
+    epilog='Ex/Ej: python %(prog)s -src ./hosts -t dir -root /tmp/pool')
+  parser.add_argument('-src', '--source-dir', action="store", dest="src", required=True, help="Directory with one subdirectory per host (FQDN)/Directorio con un subdirectorio por host (FQDN).")
+  parser.add_argument('-dst', '--dest-dir', action="store", dest="dst", default="/etc/condor", help="Destination directory in each host/Directorio destino en cada host.")
+  parser.add_argument('-t', '--transport', action="store", dest="transport", choices=['dir', 'ssh'], default="ssh", help="Transport/Transporte: dir=Local directory/Directorio local, ssh=ssh+rsync")
+  parser.add_argument('-root', '--root-dir', action="store", dest="root", help="Root directory for dir transport/Directorio raiz para el transporte dir.")
+  parser.add_argument('-u', '--user', action="store", dest="user", default="root", help="SSH user/Usuario SSH.")
+  parser.add_argument('-w', '--workers', action="store", dest="workers", type=int, default=16, help="Maximum concurrent hosts/Maximo de hosts concurrentes.")
+  parser.add_argument('-r', '--retries', action="store", dest="retries", type=int, default=3, help="Retries per operation/Reintentos por operacion.")
+  parser.add_argument('-b', '--backoff', action="store", dest="backoff", type=float, default=1.0, help="Initial seconds between retries, doubled each time/Segundos iniciales entre reintentos, se duplican cada vez.")
+  result=parser.parse_args()
+
+  if(not os.path.isdir(result.src)):
+    print("-src: Invalid source directory / Directorio fuente no valido")
+    exit(1)
+  if(result.transport=="dir"):
+    if(not result.root):
+      print("-root: Missing root directory / Falta directorio raiz")
+      exit(1)
+    transport=DirTransport(result.root)
+  else:
+    transport=SshTransport(result.user)
+
+  dep=Deploy(transport,result.workers,result.retries,result.backoff)
+  if(not dep.run(dep.collect(result.src,result.dst))):
+    exit(1)
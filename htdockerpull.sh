@@ -0,0 +1,17 @@
+#!/bin/bash
+##
+# htdockerpull.sh
+# Pre-descarga imagenes Docker para tareas del universo Docker, usado como
+# STARTD_CRON por htconfig.py (-dpi). Publica las imagenes listas como ClassAd.
+# Pre-pulls Docker images for Docker universe jobs, used as STARTD_CRON by
+# htconfig.py (-dpi). Publishes the ready images as a ClassAd.
+##
+# Use: htdockerpull.sh image1 [image2 ...]
+DOCKER=${DOCKER:-/usr/bin/docker}
+ok=""
+for img in "$@"; do
+  if ${DOCKER} pull -q "${img}" >/dev/null 2>&1; then
+    ok="${ok:+${ok},}${img}"
+  fi
+done
+echo "DockerWarmImages = \"${ok}\""
@@ -0,0 +1,167 @@
+# This Python file uses the following encoding: utf-8
+"""
+ Script para exportar las configuraciones de todos los nodos del
+ inventario directamente a un archivo tar o zip, sin archivos temporales.
+ Cada configuracion se genera, se agrega al archivo y se descarta antes
+ de generar la siguiente.
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Copia de los argumentos por nodo
+import copy
+# Compresion gzip con fecha fija
+import gzip
+# Hash de cada configuracion para el manifiesto
+import hashlib
+# Miembros del tar en memoria
+import io
+# Archivos de salida
+import tarfile
+import zipfile
+# Opciones por tipo de nodo (-ro)
+import shlex
+# Fecha de los miembros del tar
+import time
+# Generacion de configuraciones
+import htconfig
+
+# Nombre del manifiesto dentro del archivo (formato de sha256sum -c).
+MANIFEST="MANIFEST.sha256"
+
+"""
+  Escritor de archivos tar (.tar, .tar.gz, .tgz, .tar.bz2), en modo
+  stream para no retroceder en el archivo de salida. mtime fija la fecha
+  de los miembros (y del gzip), None usa la fecha actual.
+"""
+class TarWriter(object):
+  def __init__(self,path,mtime=None):
+    self.mtime=mtime
+    self.gz=None
+    if(path.endswith(".gz") or path.endswith(".tgz")):
+      self.gz=gzip.GzipFile(path,"wb",mtime=mtime)
+      self.tar=tarfile.open(fileobj=self.gz,mode="w|")
+    elif(path.endswith(".bz2")):
+      self.tar=tarfile.open(path,"w|bz2")
+    else:
+      self.tar=tarfile.open(path,"w|")
+
+  def add(self,name,data):
+    info=tarfile.TarInfo(name)
+    info.size=len(data)
+    info.mtime=time.time() if self.mtime is None else self.mtime
+    info.mode=0o644
+    self.tar.addfile(info,io.BytesIO(data))
+
+  def close(self):
+    self.tar.close()
+    if(self.gz):
+      self.gz.close()
+
+"""
+  Escritor de archivos zip. mtime fija la fecha de los miembros, None usa
+  la fecha actual.
+"""
+class ZipWriter(object):
+  def __init__(self,path,mtime=None):
+    self.mtime=mtime
+    self.zip=zipfile.ZipFile(path,"w",zipfile.ZIP_DEFLATED)
+
+  def add(self,name,data):
+    if(self.mtime is None):
+      self.zip.writestr(name,data)
+    else:
+      # Zip no soporta fechas anteriores a 1980.
+      info=zipfile.ZipInfo(name,time.gmtime(max(self.mtime,315532800))[:6])
+      info.compress_type=zipfile.ZIP_DEFLATED
+      info.external_attr=0o644<<16
+      self.zip.writestr(info,data)
+
+  def close(self):
+    self.zip.close()
+
+"""
+  Clase encargada de generar la configuracion de cada nodo del inventario
+  y agregarla al archivo de salida junto con el manifiesto.
+"""
+class Export(object):
+  # roles: argumentos por tipo de nodo (-ro), stamp: incluir la fecha en las configuraciones.
+  def __init__(self,args,member="condor_config.local",roles=None,stamp=True):
+    self.args=args
+    self.member=member
+    self.roles=roles or {}
+    self.stamp=stamp
+    # Errores por host: {fqdn: [mensajes de error]}
+    self.errors={}
+
+  # Generar (fqdn, configuracion) para cada nodo, None si hubo errores.
+  def render(self,nodes):
+    for node in nodes:
+      # Las etapas pueden modificar los argumentos (ej. -pp agrega a -cj).
+      args=copy.deepcopy(self.roles.get(node["node"],self.args))
+      if(node["node"]):
+        args.node=node["node"]
+      # El FQDN viene del inventario, sin consultar el DNS por nodo.
+      ins=htconfig.Install(args,"htexport.py",node["fqdn"])
+      if(not self.stamp):
+        ins.setDate(None)
+      # Compartir el inventario ya leido.
+      ins.inventory=nodes
+      data=ins.renderConfig()
+      if(data is None):
+        self.errors[node["fqdn"]]=[ins.msgs_error.get(e,e) for e in ins.errores]
+      yield node["fqdn"],data
+
+  # Escribir en writer las configuraciones y el manifiesto, retorna los hosts exportados.
+  def run(self,writer,nodes):
+    manifest=[]
+    for fqdn,data in self.render(nodes):
+      if(data is None):
+        continue
+      name="hosts/%s/%s" % (fqdn,self.member)
+      data=data.encode("utf-8")
+      writer.add(name,data)
+      manifest.append("%s  %s\n" % (hashlib.sha256(data).hexdigest(),name))
+    writer.add(MANIFEST,"".join(manifest).encode("utf-8"))
+    writer.close()
+    return len(manifest)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Fleet Config Export <=',
+    epilog='Other arguments are passed to htconfig.py (task c, -nt is taken from the inventory)/Los demas argumentos se pasan a htconfig.py (tarea c, -nt se toma del inventario). Ex/Ej: python %(prog)s -o pool.tar.gz -inv pool.txt -cm cm.domain.org -ds')
+  parser.add_argument('-o', '--output', action="store", dest="output", required=True, help="Output archive (.tar, .tar.gz, .tgz, .tar.bz2, .zip)/Archivo de salida (.tar, .tar.gz, .tgz, .tar.bz2, .zip).")
+  parser.add_argument('-m', '--member', action="store", dest="member", default="condor_config.local", help="File name of each config inside hosts/<fqdn>/ / Nombre de cada configuracion dentro de hosts/<fqdn>/.")
+  parser.add_argument('-ro', '--role-options', action="append", dest="roles", metavar="TYPE:OPTIONS", help="Extra htconfig.py options only for nodes of TYPE (m, s, e, ms), can be repeated. Ex -ro \"e:-ds -cp\" -ro m:-pr / Opciones extra de htconfig.py solo para nodos de tipo TYPE (m, s, e, ms), puede repetirse. Ej. -ro \"e:-ds -cp\" -ro m:-pr")
+  parser.add_argument('-nts', '--no-timestamps', action="store_true", dest="notimestamps", default=False, help="Reproducible export: no dates in configs or archive members/Exportacion reproducible: sin fechas en configuraciones ni miembros del archivo.")
+  result,rest=parser.parse_known_args()
+
+  args=htconfig.parser.parse_args(["c"]+rest)
+  if(not args.inventory):
+    print("-inv: Missing inventory file / Falta archivo de inventario")
+    exit(1)
+  roles={}
+  for role in result.roles or []:
+    node,opts=role.split(":",1) if ":" in role else (role,"")
+    if(node not in ("m","s","e","ms")):
+      print("-ro: Invalid node type %s (m,s,e,ms) / Tipo de nodo %s no valido (m,s,e,ms)" % (node,node))
+      exit(1)
+    roles[node]=htconfig.parser.parse_args(["c"]+rest+shlex.split(opts))
+  # Estas opciones detectan el hardware del equipo actual, no el de cada nodo.
+  for a in [args]+list(roles.values()):
+    local=[o for o,v in (("-rs",a.rs),("-fs",a.fastscratch),("-cg",a.cgroups),("-ftp",a.ftprofile is not None)) if v]
+    if(local):
+      print("%s: Options detect this computer's hardware, not supported in export / Las opciones detectan el hardware de este equipo, no soportadas al exportar" % ",".join(local))
+      exit(1)
+  nodes=htconfig.VerificaTipo().readInventory(args.inventory)
+  mtime=0 if result.notimestamps else None
+  writer=ZipWriter(result.output,mtime) if result.output.endswith(".zip") else TarWriter(result.output,mtime)
+  exp=Export(args,result.member,roles,not result.notimestamps)
+  total=exp.run(writer,nodes)
+  print("----- Export/Exportacion: %s hosts, %s OK, %s FAIL -----" % (len(nodes),total,len(exp.errors)))
+  for fqdn in sorted(exp.errors):
+    for msg in exp.errors[fqdn]:
+      print("Error [%s]: %s" % (fqdn,msg))
+  if(exp.errors):
+    exit(1)
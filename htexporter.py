@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# This Python file uses the following encoding: utf-8
+"""
+ Exportador de metricas de HTCondor en formato de texto Prometheus,
+ instalado por htconfig.py con -stats y -mx. Lee los ClassAds publicados
+ por los demonios (condor_status -l) o sus archivos de ClassAd y expone
+ los atributos numericos en un puerto local o en un archivo.
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Archivo de salida
+import os
+# Nombres de metricas
+import re
+# Consulta de los ClassAds publicados
+import subprocess
+# Bloqueo del cache de metricas
+import threading
+# Tiempos y esperas
+import time
+# Servidor HTTP local
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Prefijo de todas las metricas.
+PREFIX="htcondor"
+
+# Dividir texto de ClassAds en formato largo (-l) en diccionarios, un anuncio por bloque.
+def parseAds(text):
+  ads=[]
+  ad={}
+  for l in text.split("\n"):
+    l=l.strip()
+    if(not l):
+      if(ad):
+        ads.append(ad)
+      ad={}
+    elif("=" in l and not l.startswith("#")):
+      attr,value=l.split("=",1)
+      ad[attr.strip()]=value.strip()
+  if(ad):
+    ads.append(ad)
+  return ads
+
+# Valor numerico de un atributo, None si no es numero ni booleano.
+def adNumber(value):
+  low=value.lower()
+  if(low in ("true","false")):
+    return 1.0 if low=="true" else 0.0
+  try:
+    return float(value)
+  except ValueError:
+    return None
+
+# Nombre de metrica: NegotiationCycleDuration -> negotiation_cycle_duration
+def metricName(kind,attr):
+  attr=re.sub(r"(?<=[a-z0-9])(?=[A-Z])","_",attr)
+  return re.sub(r"[^a-zA-Z0-9_]","_","%s_%s_%s" % (PREFIX,kind,attr)).lower()
+
+# Escapar el valor de una etiqueta.
+def labelStr(value):
+  return value.strip('"').replace("\\","\\\\").replace('"','\\"')
+
+"""
+  Fuentes de ClassAds: demonios consultados con condor_status (-d) y
+  archivos de ClassAd escritos por los demonios (-af).
+"""
+class Sources(object):
+  def __init__(self,daemons=None,files=None,timeout=30):
+    self.daemons=daemons or []
+    self.files=files or []
+    self.timeout=timeout
+
+  # Retorna lista de (fuente, anuncios o None si no se pudo leer).
+  def read(self):
+    ret=[]
+    for daemon in self.daemons:
+      try:
+        out=subprocess.check_output(["condor_status","-%s" % daemon,"-l"],timeout=self.timeout)
+        ret.append((daemon,parseAds(out.decode("utf-8","replace"))))
+      except (OSError,subprocess.SubprocessError):
+        ret.append((daemon,None))
+    for path in self.files:
+      try:
+        with open(path,"r") as f:
+          ret.append((path,parseAds(f.read())))
+      except (IOError,OSError):
+        ret.append((path,None))
+    return ret
+
+# Texto Prometheus de las fuentes leidas.
+def ads2Metrics(sourceAds):
+  samples={}
+  up=[]
+  for source,ads in sourceAds:
+    up.append('%s_up{source="%s"} %s' % (PREFIX,labelStr(source),0 if ads is None else 1))
+    for ad in ads or []:
+      kind=ad.get("MyType","daemon").strip('"')
+      labels='name="%s"' % labelStr(ad.get("Name","unknown"))
+      for attr,value in ad.items():
+        num=adNumber(value)
+        if(num is None):
+          continue
+        samples.setdefault(metricName(kind,attr),[]).append("{%s} %s" % (labels,"%d" % num if num.is_integer() else repr(num)))
+  lines=["# TYPE %s_up gauge" % PREFIX]+up
+  for name in sorted(samples):
+    lines.append("# TYPE %s gauge" % name)
+    lines+=["%s%s" % (name,s) for s in samples[name]]
+  return "\n".join(lines)+"\n"
+
+"""
+  Cache de metricas: las fuentes se leen a lo sumo una vez cada ttl
+  segundos, sin importar cuantas veces se consulte el exportador.
+"""
+class Metrics(object):
+  def __init__(self,sources,ttl=30):
+    self.sources=sources
+    self.ttl=ttl
+    self.text=""
+    self.stamp=0
+    self.lock=threading.Lock()
+
+  def get(self):
+    with self.lock:
+      if(time.time()-self.stamp>=self.ttl):
+        self.text=ads2Metrics(self.sources.read())
+        self.stamp=time.time()
+      return self.text
+
+# Escribir las metricas en path de forma atomica.
+def writeFile(metrics,path):
+  tmp="%s.tmp" % path
+  with open(tmp,"w") as f:
+    f.write(metrics.get())
+  os.rename(tmp,path)
+
+# Servidor HTTP que responde las metricas en /metrics.
+def serve(metrics,port,addr=""):
+  class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+      if(self.path.split("?")[0]!="/metrics"):
+        self.send_error(404)
+        return
+      data=metrics.get().encode("utf-8")
+      self.send_response(200)
+      self.send_header("Content-Type","text/plain; version=0.0.4")
+      self.send_header("Content-Length","%s" % len(data))
+      self.end_headers()
+      self.wfile.write(data)
+
+    def log_message(self,fmt,*fargs):
+      pass
+  HTTPServer((addr,port),Handler).serve_forever()
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Prometheus Metrics Exporter <=',
+    epilog='Ex/Ej: python %(prog)s -p 9118 -d collector,negotiator -af /var/log/condor/.schedd_classad')
+  parser.add_argument('-d', '--daemons', action="store", dest="daemons", help="Daemon ads to query with condor_status (Ex: collector,negotiator,schedd)/Anuncios de demonios a consultar con condor_status (Ej: collector,negotiator,schedd).")
+  parser.add_argument('-af', '--ad-files', action="store", dest="files", nargs="+", help="ClassAd files written by the daemons/Archivos de ClassAd escritos por los demonios.")
+  parser.add_argument('-p', '--port', action="store", dest="port", type=int, help="Serve metrics on http://ADDR:PORT/metrics / Servir metricas en http://ADDR:PORT/metrics.")
+  parser.add_argument('-a', '--address', action="store", dest="addr", default="", help="Address to listen on/Direccion en la que escuchar.")
+  parser.add_argument('-o', '--output', action="store", dest="output", help="Write metrics to file (Ex: node_exporter textfile collector)/Escribir metricas en archivo (Ej: textfile collector de node_exporter).")
+  parser.add_argument('-i', '--interval', action="store", dest="interval", type=int, default=0, help="With -o: rewrite every INTERVAL seconds, 0=once/Con -o: reescribir cada INTERVAL segundos, 0=una vez.")
+  parser.add_argument('-ttl', '--ttl', action="store", dest="ttl", type=int, default=30, help="Seconds to cache the ads between scrapes/Segundos de cache de los anuncios entre consultas.")
+  result=parser.parse_args()
+
+  if(not result.daemons and not result.files):
+    print("-d,-af: Missing ad sources / Faltan fuentes de anuncios")
+    exit(1)
+  if(not result.port and not result.output):
+    print("-p,-o: Missing port or output file / Falta puerto o archivo de salida")
+    exit(1)
+  sources=Sources(result.daemons.split(",") if result.daemons else [],result.files)
+  if(result.output):
+    metrics=Metrics(sources,0)
+    writeFile(metrics,result.output)
+    while(result.interval>0):
+      time.sleep(result.interval)
+      writeFile(metrics,result.output)
+  else:
+    serve(Metrics(sources,result.ttl),result.port,result.addr)
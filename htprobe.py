@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# This Python file uses the following encoding: utf-8
+"""
+ Sonda de rendimiento del nodo para STARTD_CRON, instalada por htconfig.py
+ con -pp. Mide velocidad de CPU, escritura en disco local y ancho de banda
+ de memoria, y los publica como atributos ClassAd (con prefijo MY_).
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Carga de CPU
+import hashlib
+# Archivo temporal en disco
+import os
+import tempfile
+# Medicion de tiempos
+import time
+
+# Valores de referencia para PerfScore=100 / Reference values for PerfScore=100
+REF_CPU=500.0
+REF_MEM=5000.0
+REF_DISK=200.0
+
+# MB/s de hash md5 sobre un buffer de 1MB durante secs segundos.
+def cpuMBps(secs):
+  buf=b"\0" * (1 << 20)
+  n=0
+  start=time.time()
+  while time.time()-start<secs:
+    hashlib.md5(buf).digest()
+    n+=1
+  return n/(time.time()-start)
+
+# MB/s de copia de memoria, usando un buffer de size MB.
+def memMBps(size,secs):
+  src=bytearray(size << 20)
+  dst=bytearray(size << 20)
+  n=0
+  start=time.time()
+  while time.time()-start<secs:
+    dst[:]=src
+    n+=1
+  return n*size/(time.time()-start)
+
+# MB/s de escritura sincronizada de size MB en el directorio path.
+def diskMBps(path,size):
+  block=os.urandom(1 << 20)
+  fd,name=tempfile.mkstemp(prefix=".htprobe",dir=path)
+  try:
+    start=time.time()
+    for i in range(size):
+      os.write(fd,block)
+    os.fsync(fd)
+    return size/(time.time()-start)
+  finally:
+    os.close(fd)
+    os.unlink(name)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Node Performance Probe <=')
+  parser.add_argument('-d', '--dir', action="store", dest="dir", default=tempfile.gettempdir(), help="Scratch directory to test/Directorio de trabajo a probar.")
+  parser.add_argument('-s', '--size', action="store", dest="size", type=int, default=64, help="MB written to disk and copied in memory/MB escritos en disco y copiados en memoria.")
+  parser.add_argument('-t', '--time', action="store", dest="time", type=float, default=1.0, help="Seconds for CPU and memory tests/Segundos para las pruebas de CPU y memoria.")
+  result=parser.parse_args()
+
+  cpu=cpuMBps(result.time)
+  mem=memMBps(result.size,result.time)
+  try:
+    disk=diskMBps(result.dir,result.size)
+  except OSError:
+    disk=0.0
+  score=100*(0.5*cpu/REF_CPU+0.3*mem/REF_MEM+0.2*disk/REF_DISK)
+  print("PerfCpuMBps = %.1f" % cpu)
+  print("PerfMemMBps = %.1f" % mem)
+  print("PerfDiskMBps = %.1f" % disk)
+  print("PerfScore = %.1f" % score)
@@ -0,0 +1,149 @@
+# This Python file uses the following encoding: utf-8
+"""
+ Script para aplicar condor_reconfig/condor_restart en oleadas sobre los
+ nodos del pool, evitando que todos los demonios se anuncien al mismo
+ tiempo ante el Collector/Negotiator.
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Jitter entre hosts de una oleada
+import random
+# Ejecucion de comandos remotos
+import subprocess
+# Tiempos y esperas
+import time
+# Concurrencia dentro de una oleada
+from concurrent.futures import ThreadPoolExecutor
+# Lectura de inventario
+from htconfig import VerificaTipo
+
+# Orden de las oleadas por tipo de nodo: ejecucion, envio y maestro al final.
+ROLE_ORDER=["e","s","ms","m"]
+# Comandos de recarga disponibles.
+ACTIONS={"reconfig":"condor_reconfig","restart":"condor_restart"}
+
+"""
+  Ejecutor local para pruebas: no contacta los hosts, solo registra la
+  llamada y simula una demora. Cada ejecutor implementa run(host,command),
+  que retorna True si el comando fue exitoso.
+"""
+class LocalExecutor(object):
+  def __init__(self,delay=0.0):
+    self.delay=delay
+    self.calls=[]
+
+  def run(self,host,command):
+    time.sleep(self.delay)
+    self.calls.append((host,command,time.time()))
+    return True
+
+"""
+  Ejecutor por ssh, ejecuta el comando directamente en el host.
+"""
+class SshExecutor(object):
+  def __init__(self,user="root",timeout=10):
+    self.user=user
+    self.timeout=timeout
+
+  def run(self,host,command):
+    target="%s@%s" % (self.user,host) if self.user else host
+    return subprocess.call(["ssh","-o","BatchMode=yes","-o","ConnectTimeout=%s" % self.timeout,target,command])==0
+
+"""
+  Ejecutor usando las herramientas de HTCondor desde el nodo actual
+  (condor_reconfig -name host), requiere permisos ADMINISTRATOR.
+"""
+class CondorExecutor(object):
+  def run(self,host,command):
+    return subprocess.call([command,"-name",host])==0
+
+"""
+  Clase encargada de agrupar los hosts en oleadas y aplicar el comando.
+"""
+class Rolling(object):
+  def __init__(self,executor,action="reconfig",waveSize=10,jitter=0.0,pause=0.0,seed=None):
+    self.executor=executor
+    self.command=ACTIONS[action]
+    self.waveSize=waveSize
+    self.jitter=jitter
+    self.pause=pause
+    self.random=random.Random(seed)
+    # Resultados por oleada: (tipo, hosts, fallidos, segundos)
+    self.results=[]
+
+  # Dividir nodos [{fqdn,node}] en oleadas ordenadas por tipo de nodo.
+  def waves(self,nodes):
+    ret=[]
+    for role in ROLE_ORDER:
+      hosts=[n["fqdn"] for n in nodes if n["node"]==role]
+      for idx in range(0,len(hosts),self.waveSize):
+        ret.append((role,hosts[idx:idx+self.waveSize]))
+    return ret
+
+  # Esperar un jitter aleatorio y aplicar el comando en host.
+  def runHost(self,host,delay):
+    time.sleep(delay)
+    try:
+      return self.executor.run(host,self.command)
+    except Exception:
+      return False
+
+  # Aplicar el comando en todos los hosts de una oleada.
+  def runWave(self,hosts):
+    start=time.time()
+    delays=[self.random.uniform(0,self.jitter) for h in hosts]
+    with ThreadPoolExecutor(max_workers=len(hosts)) as pool:
+      oks=list(pool.map(self.runHost,hosts,delays))
+    failed=[h for h,ok in zip(hosts,oks) if not ok]
+    return failed,time.time()-start
+
+  # Ejecutar todas las oleadas, retorna True si no hubo fallos.
+  def run(self,nodes):
+    waves=self.waves(nodes)
+    ok=True
+    # Nodos sin tipo valido nunca entran en una oleada.
+    for n in nodes:
+      if(n["node"] not in ROLE_ORDER):
+        print("Error [%s]: Unknown node type/Tipo de nodo desconocido: %s" % (n["fqdn"],n["node"]))
+        ok=False
+    for idx,(role,hosts) in enumerate(waves):
+      if(idx>0 and self.pause>0):
+        time.sleep(self.pause)
+      failed,secs=self.runWave(hosts)
+      self.results.append((role,hosts,failed,secs))
+      print("[wave/oleada %s/%s] type/tipo=%s hosts=%s FAIL=%s latency/latencia=%.2fs" % (idx+1,len(waves),role,len(hosts),len(failed),secs))
+      for h in failed:
+        print("Error [%s]: %s failed/fallo" % (h,self.command))
+      ok=ok and not failed
+    return ok
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Rolling Reconfig <=',
+    epilog='Ex/Ej: python %(prog)s -inv pool.txt -a reconfig -ws 50 -j 5')
+  parser.add_argument('-inv', '--inventory', action="store", dest="inventory", required=True, help="Inventory file, one 'fqdn type' per line/Archivo de inventario, una linea 'fqdn tipo' por nodo.")
+  parser.add_argument('-a', '--action', action="store", dest="action", choices=['reconfig', 'restart'], default="reconfig", help="Command to issue/Comando a ejecutar.")
+  parser.add_argument('-ws', '--wave-size', action="store", dest="wavesize", type=int, default=10, help="Hosts per wave/Hosts por oleada.")
+  parser.add_argument('-j', '--jitter', action="store", dest="jitter", type=float, default=2.0, help="Maximum random delay (seconds) per host inside a wave/Demora aleatoria maxima (segundos) por host en una oleada.")
+  parser.add_argument('-pw', '--pause-waves', action="store", dest="pause", type=float, default=10.0, help="Seconds between waves/Segundos entre oleadas.")
+  parser.add_argument('-x', '--executor', action="store", dest="executor", choices=['local', 'ssh', 'condor'], default="ssh", help="Command executor/Ejecutor de comandos: local=stub for tests/simulado para pruebas, ssh, condor=condor_* -name host")
+  parser.add_argument('-u', '--user', action="store", dest="user", default="root", help="SSH user/Usuario SSH.")
+  parser.add_argument('-seed', '--seed', action="store", dest="seed", type=int, help="Random seed for jitter/Semilla aleatoria para el jitter.")
+  result=parser.parse_args()
+
+  if(result.wavesize<1):
+    print("-ws: Invalid wave size / Tamano de oleada no valido")
+    exit(1)
+  if(result.executor=="local"):
+    executor=LocalExecutor()
+  elif(result.executor=="condor"):
+    executor=CondorExecutor()
+  else:
+    executor=SshExecutor(result.user)
+
+  nodes=VerificaTipo().readInventory(result.inventory)
+  rol=Rolling(executor,result.action,result.wavesize,result.jitter,result.pause,result.seed)
+  if(not rol.run(nodes)):
+    exit(1)
@@ -0,0 +1,263 @@
+# This Python file uses the following encoding: utf-8
+"""
+ Simulador de eventos discretos de un pool HTCondor configurado con
+ htconfig.py. Permite comparar variantes de slots (-rs, -ds, -ajs),
+ cuantizacion, expulsion y MaxVacateTime con una traza de tareas antes
+ de aplicarlas en el pool.
+  Octubre 2026
+"""
+# Manejo de argumentos
+import argparse
+# Lectura de la traza de tareas
+import csv
+# Cola de eventos
+import heapq
+# Lectura de expresiones de la configuracion
+import re
+# Lectura de la configuracion generada
+from htconfig import Install
+
+# Tipos de evento, en orden de procesamiento para un mismo instante.
+EV_END=0
+EV_FREE=1
+EV_SUBMIT=2
+EV_CYCLE=3
+
+"""
+  Nodo simulado: slots estaticos o particionables creados a partir de
+  una configuracion generada por htconfig.py.
+"""
+class Node(object):
+  def __init__(self,name,cfg,cpus,memory,disk):
+    self.name=name
+    self.cpus=cpus
+    self.memory=memory
+    self.disk=disk
+    self.slots=[]
+    self.policy(cfg)
+    self.layout(cfg)
+
+  # Leer cuantizacion, expulsion y MaxVacateTime de la configuracion.
+  def policy(self,cfg):
+    def val(knob,default=None):
+      return cfg[knob][1] if knob in cfg else default
+    self.memQuantum=self.quantum(val("MODIFY_REQUEST_EXPR_REQUESTMEMORY"),1)
+    self.diskQuantum=self.quantum(val("MODIFY_REQUEST_EXPR_REQUESTDISK"),1024)//1024 or 1
+    self.memDefault=int(val("JOB_DEFAULT_REQUESTMEMORY","0"))
+    self.diskDefault=int(val("JOB_DEFAULT_REQUESTDISK","0"))//1024
+    self.cgroup=(val("CGROUP_MEMORY_LIMIT_POLICY","none").lower()=="hard")
+    self.memPolicy=("MEMORY_EXCEEDED" in cfg) or self.cgroup
+    self.diskPolicy=("DISK_EXCEEDED" in cfg)
+    self.vacate=self.seconds(val("MAXVACATETIME","10 * $(MINUTE)"))
+    self.consumption=val("CONSUMPTION_POLICY","false")
+
+  # Valor de quantize(Attr, {N}), default si no hay.
+  def quantum(self,expr,default):
+    m=re.search(r"quantize\([^,]+,\s*\{\s*(\d+)",expr or "")
+    return int(m.group(1)) if m else default
+
+  # Evaluar expresiones simples de tiempo como 2 * $(MINUTE).
+  def seconds(self,expr):
+    expr=expr.replace("$(MINUTE)","60").replace("$(HOUR)","3600")
+    if(re.match(r"^[\d\s\*\+\-/\(\)]+$",expr)):
+      return int(eval(expr))
+    return 600
+
+  # Crear los slots segun SLOT_TYPE_n y NUM_SLOTS_TYPE_n.
+  def layout(self,cfg):
+    types=sorted(int(m.group(1)) for m in (re.match(r"^SLOT_TYPE_(\d+)$",k) for k in cfg) if m)
+    freeCpus=self.cpus
+    freeMem=self.memory
+    pending=[]
+    for t in types:
+      spec=dict(kv.strip().split("=",1) for kv in cfg["SLOT_TYPE_%s" % t][1].split(","))
+      count=int(cfg["NUM_SLOTS_TYPE_%s" % t][1]) if "NUM_SLOTS_TYPE_%s" % t in cfg else 1
+      part=cfg.get("SLOT_TYPE_%s_PARTITIONABLE" % t,("","false"))[1].lower()=="true"
+      start=cfg.get("SLOT_TYPE_%s_START" % t,("","True"))[1].strip().lower()!="false"
+      # Con politica de consumo el slot acepta varias tareas por ciclo.
+      cons=cfg.get("SLOT_TYPE_%s_CONSUMPTION_POLICY" % t,("",self.consumption))[1].lower()=="true"
+      for i in range(count):
+        pending.append((spec,part,start,cons))
+        # Recursos fijos primero, los auto reciben lo que quede.
+        if(spec.get("cpu","auto")!="auto"):
+          freeCpus-=int(spec["cpu"])
+        if(spec.get("ram","auto")!="auto"):
+          freeMem-=self.amount(spec["ram"],self.memory)
+    autos=len([p for p in pending if p[0].get("cpu","auto")=="auto"]) or 1
+    autoMem=len([p for p in pending if p[0].get("ram","auto")=="auto"]) or 1
+    for spec,part,start,cons in pending:
+      cpus=int(spec["cpu"]) if spec.get("cpu","auto")!="auto" else freeCpus//autos
+      mem=self.amount(spec["ram"],self.memory) if spec.get("ram","auto")!="auto" else freeMem//autoMem
+      self.slots.append({"cpus":cpus,"memory":mem,"disk":self.disk*cpus//max(1,self.cpus),
+                         "partitionable":part,"start":start,"consumption":cons,"used":[0,0,0],"matched":False})
+    # Sin slots definidos: un slot estatico por core (comportamiento por defecto).
+    if(not self.slots):
+      for i in range(self.cpus):
+        self.slots.append({"cpus":1,"memory":self.memory//self.cpus,"disk":self.disk//self.cpus,
+                           "partitionable":False,"start":True,"consumption":False,"used":[0,0,0],"matched":False})
+
+  # Cantidad absoluta desde "N" o "N%" del total.
+  def amount(self,spec,total):
+    spec=spec.strip()
+    if(spec.endswith("%")):
+      return total*int(spec[:-1])//100
+    return int(spec)
+
+  # Recursos solicitados por la tarea luego de aplicar valores por defecto y cuantizacion.
+  def request(self,job):
+    mem=job["memory"] or self.memDefault
+    disk=job["disk"] or self.diskDefault
+    mem=-(-mem//self.memQuantum)*self.memQuantum
+    disk=-(-disk//self.diskQuantum)*self.diskQuantum
+    return [job["cpus"],mem,disk]
+
+  # Buscar slot para la tarea, retorna (slot, recursos) o None.
+  def match(self,job):
+    req=self.request(job)
+    for slot in self.slots:
+      if(not slot["start"] or (slot["matched"] and not slot["consumption"])):
+        continue
+      free=[slot["cpus"]-slot["used"][0],slot["memory"]-slot["used"][1],slot["disk"]-slot["used"][2]]
+      if(slot["partitionable"]):
+        if(all(f>=r for f,r in zip(free,req))):
+          return slot,req
+      elif(slot["used"][0]==0 and slot["cpus"]>=req[0] and slot["memory"]>=req[1]):
+        return slot,[slot["cpus"],slot["memory"],slot["disk"]]
+    return None
+
+  def freeCpus(self):
+    return sum(s["cpus"]-s["used"][0] for s in self.slots if s["start"])
+
+"""
+  Simulador de eventos discretos del pool.
+"""
+class Simulator(object):
+  def __init__(self,nodes,cycle=60,poll=5):
+    self.nodes=nodes
+    self.cycle=cycle
+    self.poll=poll
+    self.events=[]
+    self.seq=0
+    self.idle=[]
+    self.done=[]
+    self.held=[]
+    self.busy=0.0
+    self.idleSamples=[]
+
+  def push(self,t,kind,data):
+    self.seq+=1
+    heapq.heappush(self.events,(t,kind,self.seq,data))
+
+  # Ejecutar la tarea en el slot, programando su fin o su expulsion.
+  def start(self,t,node,slot,res,job):
+    slot["matched"]=True
+    for i in range(3):
+      slot["used"][i]+=res[i]
+    job["start"]=t
+    job["alloc"]=res
+    # Sin uso medido en la traza (0) no se aplican las politicas de exceso.
+    mem=job["memory_usage"]
+    disk=job["disk_usage"]
+    if(node.memPolicy and mem and mem*1.1>res[1]):
+      # Con cgroups el kernel termina la tarea al instante, sin desalojo.
+      if(node.cgroup):
+        self.push(t,EV_END,(node,slot,job,"held",0))
+      else:
+        self.push(t+self.poll,EV_END,(node,slot,job,"held",node.vacate))
+    elif(node.diskPolicy and disk and disk>res[2]):
+      self.push(t+self.poll,EV_END,(node,slot,job,"held",node.vacate))
+    else:
+      self.push(t+job["runtime"],EV_END,(node,slot,job,"done",0))
+
+  # Ciclo de negociacion: asignar tareas inactivas en orden de llegada.
+  def negotiate(self,t):
+    for node in self.nodes:
+      for slot in node.slots:
+        slot["matched"]=False
+    pending=[]
+    for job in self.idle:
+      for node in self.nodes:
+        m=node.match(job)
+        if(m):
+          self.start(t,node,m[0],m[1],job)
+          break
+      else:
+        pending.append(job)
+    self.idle=pending
+    if(self.idle):
+      total=sum(n.cpus for n in self.nodes)
+      self.idleSamples.append(float(sum(n.freeCpus() for n in self.nodes))/total)
+
+  def run(self,jobs):
+    for job in jobs:
+      self.push(job["submit"],EV_SUBMIT,job)
+    self.push(0,EV_CYCLE,None)
+    end=0
+    while self.events:
+      t,kind,seq,data=heapq.heappop(self.events)
+      if(kind==EV_SUBMIT):
+        self.idle.append(data)
+      elif(kind==EV_END):
+        node,slot,job,state,vacate=data
+        job["end"]=t
+        self.busy+=(t-job["start"])*job["alloc"][0]
+        (self.done if state=="done" else self.held).append(job)
+        # Los recursos se liberan despues del tiempo de desalojo.
+        self.push(t+vacate,EV_FREE,(slot,job["alloc"]))
+        end=max(end,t)
+      elif(kind==EV_FREE):
+        slot,res=data
+        for i in range(3):
+          slot["used"][i]-=res[i]
+      elif(kind==EV_CYCLE):
+        self.negotiate(t)
+        # Continuar mientras queden eventos que puedan cambiar el estado.
+        if(self.events):
+          self.push(t+self.cycle,EV_CYCLE,None)
+    return end
+
+  # Reporte de rendimiento, espera y fragmentacion.
+  def report(self,end):
+    waits=sorted(j["start"]-j["submit"] for j in self.done+self.held)
+    total=sum(n.cpus for n in self.nodes)
+    def pct(p):
+      return waits[min(len(waits)-1,int(p*len(waits)))] if waits else 0
+    print("Jobs/Tareas: done/terminadas=%s held/retenidas=%s idle/inactivas=%s" % (len(self.done),len(self.held),len(self.idle)))
+    print("Makespan: %.0fs" % end)
+    print("Throughput: %.2f jobs/hour" % (3600.0*len(self.done)/end if end else 0))
+    print("Wait/Espera: mean/media=%.1fs p50=%.1fs p95=%.1fs" % (sum(waits)/len(waits) if waits else 0,pct(0.5),pct(0.95)))
+    print("CPU utilization/utilizacion: %.1f%%" % (100.0*self.busy/(total*end) if end else 0))
+    print("Fragmentation/Fragmentacion (free CPUs while jobs wait/CPUs libres con tareas en espera): %.1f%%" % \
+      (100.0*sum(self.idleSamples)/len(self.idleSamples) if self.idleSamples else 0))
+
+# Leer traza CSV: submit,cpus,memory,disk,runtime[,memory_usage,disk_usage] (segundos y MB).
+def readTrace(path):
+  jobs=[]
+  with open(path,"r") as f:
+    for row in csv.DictReader(f):
+      job=dict((k,int(float(row[k]))) if row.get(k) else (k,0) for k in
+               ("submit","cpus","memory","disk","runtime","memory_usage","disk_usage"))
+      job["cpus"]=job["cpus"] or 1
+      jobs.append(job)
+  return sorted(jobs,key=lambda j:j["submit"])
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    description='=> HTCondor Pool Simulator <=',
+    epilog='Ex/Ej: python %(prog)s -n condor_config.local 32 131072 1000000 10 -jobs trace.csv')
+  parser.add_argument('-n', '--nodes', action="append", dest="nodes", nargs=5, required=True, metavar=("CONFIG","CPUS","MEMORY_MB","DISK_MB","COUNT"), help="Generated config, node resources and number of nodes, can be repeated/Configuracion generada, recursos del nodo y cantidad de nodos, puede repetirse.")
+  parser.add_argument('-jobs', '--jobs', action="store", dest="jobs", required=True, help="Job trace CSV: submit,cpus,memory,disk,runtime[,memory_usage,disk_usage]/Traza de tareas CSV.")
+  parser.add_argument('-ni', '--negotiator-interval', action="store", dest="cycle", type=int, default=60, help="Seconds between negotiation cycles/Segundos entre ciclos de negociacion.")
+  parser.add_argument('-pi', '--polling-interval', action="store", dest="poll", type=int, default=5, help="Seconds for the startd to detect exceeded resources/Segundos para que el startd detecte recursos excedidos.")
+  result=parser.parse_args()
+
+  ins=Install(None,"htsim.py")
+  nodes=[]
+  for cfgFile,cpus,mem,disk,count in result.nodes:
+    with open(cfgFile,"r") as f:
+      cfg=ins.effectiveConfig(f.read())
+    for i in range(int(count)):
+      nodes.append(Node("%s#%s" % (cfgFile,i),cfg,int(cpus),int(mem),int(disk)))
+  sim=Simulator(nodes,result.cycle,result.poll)
+  sim.report(sim.run(readTrace(result.jobs)))